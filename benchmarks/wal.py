@@ -0,0 +1,61 @@
+"""Benchmarks the write overhead and recovery time of the write-ahead log.
+
+Usage: python benchmarks/wal.py [number of writes]
+"""
+import random
+import sys
+import tempfile
+import time
+
+import cows
+from cows.wal import WriteAheadLog
+
+
+def increment(match, old_value, new_value):
+    return old_value + new_value
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(writes):
+    rand = random.Random(0)
+    keys = [
+        ''.join(rand.choice('ACGTN') for _ in range(12))
+        for _ in range(writes)
+    ]
+
+    def fill(rdict):
+        for key in keys:
+            rdict[key] = 1
+        return rdict
+
+    _, baseline = timed(lambda: fill(cows.Dict(updater=increment)))
+    print('{} writes without log: {:.2f}s'.format(writes, baseline))
+
+    for checkpoint_every in (None, writes // 4):
+        with tempfile.TemporaryDirectory() as directory:
+            wal = WriteAheadLog(directory, checkpoint_every=checkpoint_every)
+            _, logged = timed(
+                lambda: fill(cows.Dict(updater=increment, wal=wal))
+            )
+            wal.close()
+
+            recovered, recovery = timed(lambda: cows.Dict(
+                updater=increment, wal=WriteAheadLog(directory)
+            ))
+
+        print(
+            'checkpoint every {}: writes {:.2f}s ({:+.0%}), recovery {:.2f}s '
+            '({} keys)'.format(
+                checkpoint_every, logged, logged / baseline - 1, recovery,
+                len(recovered)
+            )
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -1,4 +1,7 @@
-from .dictionary import Dict
+from . import aio, wal
+from .counter import Counter
+from .dawg import Dawg
+from .dictionary import Dict, merge_all, most_specific
 from .list import List
 from .trie import Trie
 from .set import Set
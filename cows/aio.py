@@ -0,0 +1,121 @@
+import asyncio
+
+
+class MatchBatcher:
+    """Coalesces concurrent match requests into batched trie traversals.
+
+    Requests made with :meth:`.get_matches` within ``window`` seconds of the
+    first pending request are answered together by a single call to
+    :meth:`.Trie.get_matches_many`, which visits each trie node at most once
+    for the whole batch.  This suits services where many tasks look up keys
+    at about the same time.
+
+    Args:
+        trie (Trie): The trie to search.
+        window (float): The number of seconds to wait for further requests
+            before searching.
+        max_batch (int): If set, a batch is searched as soon as it reaches
+            this many requests.
+        executor (concurrent.futures.Executor): If set, batched searches run
+            in this executor rather than on the event loop.
+        lock (RWLock): If set, batched searches hold this lock for reading.
+            It must be given, as ``rdict.lock``, to search the trie of a
+            ``concurrent`` :class:`.Dict` while other threads write to it.
+            Otherwise the trie must not be written to while searches run.
+            An ``executor`` should then also be used so waiting for the lock
+            does not block the event loop.
+
+    Example:
+        .. code-block:: python
+
+            import asyncio
+            import cows
+
+            batcher = cows.aio.MatchBatcher(cows.Trie(initialize=[
+                ('ATCG', 1), ('GCTA', 2)
+            ]))
+
+            async def main():
+                return await asyncio.gather(
+                    batcher.get_matches('AT*G'), batcher.get_matches('****')
+                )
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+    """
+    def __init__(self, trie, window=0.001, max_batch=None, executor=None,
+                 lock=None):
+        self.trie = trie
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self.lock = lock
+        self._pending = []
+        self._timer = None
+
+    async def get_matches(self, key):
+        """Searches the trie for strings matching ``key``.
+
+        Args:
+            key (str): The string for which to search for matches in the trie
+
+        Returns:
+            A list of ``(key, value)`` tuples for nodes that match ``key``.
+
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((key, future))
+
+        if self.max_batch and len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        """Searches for all pending requests as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        keys = [key for key, _ in pending]
+
+        if self.executor is None:
+            try:
+                self._resolve(pending, self._search(keys))
+            except Exception as ex:  # pylint: disable=broad-except
+                self._fail(pending, ex)
+            return
+
+        search = asyncio.get_event_loop().run_in_executor(
+            self.executor, self._search, keys
+        )
+
+        def _done(search):
+            if search.exception() is not None:
+                self._fail(pending, search.exception())
+            else:
+                self._resolve(pending, search.result())
+        search.add_done_callback(_done)
+
+    def _search(self, keys):
+        """Searches for ``keys`` holding the lock, if any"""
+        if self.lock is None:
+            return self.trie.get_matches_many(keys)
+        with self.lock.read():
+            return self.trie.get_matches_many(keys)
+
+    @staticmethod
+    def _resolve(pending, results):
+        """Sets the result of each pending request"""
+        for key, future in pending:
+            if not future.done():
+                future.set_result(list(results[key]))
+
+    @staticmethod
+    def _fail(pending, ex):
+        """Sets an exception for each pending request"""
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(ex)
@@ -0,0 +1,93 @@
+import heapq
+import itertools
+import pickle
+import tempfile
+
+
+DEFAULT_CHUNK_SIZE = 1000000
+
+_SPILL_BATCH_SIZE = 10000
+
+
+def _spill(chunk):
+    """Writes a sorted chunk to a temporary file in pickled batches"""
+    handle = tempfile.TemporaryFile()
+    for start in range(0, len(chunk), _SPILL_BATCH_SIZE):
+        pickle.dump(chunk[start:start + _SPILL_BATCH_SIZE], handle,
+                    pickle.HIGHEST_PROTOCOL)
+    handle.seek(0)
+    return handle
+
+
+def _read_spilled(handle):
+    """Yields the items of a chunk written by :func:`._spill`"""
+    while True:
+        try:
+            yield from pickle.load(handle)
+        except EOFError:
+            break
+
+
+def external_sort(iterable, key=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily sorts an iterable too large to hold in memory.
+
+    ``iterable`` is read ``chunk_size`` items at a time.  If it fits in a
+    single chunk it is sorted in memory.  Otherwise each chunk is sorted and
+    spilled to a temporary file, and the sorted chunks are merged as they are
+    read back.  The sort is stable.
+
+    Args:
+        iterable (iterable): The items to sort.
+        key (func): As with the builtin ``sorted``.
+        chunk_size (int): The maximum number of items held in memory while
+            sorting.
+
+    Yields:
+        The items of ``iterable`` in sorted order.
+
+    """
+    iterator = iter(iterable)
+    spilled = []
+    try:
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            chunk.sort(key=key)
+            if not spilled and len(chunk) < chunk_size:
+                yield from chunk
+                return
+            if chunk:
+                spilled.append(_spill(chunk))
+            if len(chunk) < chunk_size:
+                break
+        del chunk
+
+        yield from heapq.merge(
+            *[_read_spilled(handle) for handle in spilled], key=key
+        )
+    finally:
+        for handle in spilled:
+            handle.close()
+
+
+def common_prefix_length(first, second):
+    """Gets the length of the longest common prefix of two strings.
+
+    The length is found by binary search over slice comparisons so the
+    characters are compared in C rather than one at a time in Python.
+
+    Args:
+        first (str): The first string.
+        second (str): The second string.
+
+    Returns:
+        The number of leading characters the strings share.
+
+    """
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if first[:mid] == second[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
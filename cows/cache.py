@@ -0,0 +1,167 @@
+import collections
+import threading
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize']
+)
+
+
+class MatchCache:
+    """A bounded cache of query strings to their list of trie matches.
+
+    Entries are evicted when the cache is full according to ``policy``.
+    Since matching is ambiguous, a newly inserted key may change the results
+    of many cached queries; :meth:`.invalidate` evicts exactly those cached
+    queries which match the new key and leaves the rest in place.  Cached
+    queries are also stored in a trie of nested dictionaries so those
+    matching a new key are found by searching the trie, without checking
+    every cached query.
+
+    Args:
+        maxsize (int): The maximum number of queries to cache.
+        wildcard (char): The character representing ambiguity.
+        policy (str): Either ``lru`` to evict the least recently used query
+            or ``fifo`` to evict the least recently inserted query.
+
+    Raises:
+        ValueError
+            If ``policy`` is not a known eviction policy.
+
+    """
+    POLICIES = ('lru', 'fifo')
+
+    def __init__(self, maxsize, wildcard='*', policy='lru'):
+        if policy not in self.POLICIES:
+            raise ValueError(
+                'Policy must be one of {}, not {}'.format(
+                    ', '.join(self.POLICIES), policy))
+
+        self.maxsize = maxsize
+        self.wildcard = wildcard
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        # Nested dictionaries keyed by character, with the complete query
+        # stored under the key None at the node where it ends
+        self._queries = {}
+        self._lock = threading.Lock()
+
+    def get(self, query):
+        """Gets the cached matches for ``query``.
+
+        Args:
+            query (str): The query string.
+
+        Returns:
+            The cached list of matches, or ``None`` if ``query`` is not
+            cached.
+
+        """
+        with self._lock:
+            try:
+                matches = self._entries[query]
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.policy == 'lru':
+                self._entries.move_to_end(query)
+            return matches
+
+    def put(self, query, matches):
+        """Caches ``matches`` as the results for ``query``.
+
+        Args:
+            query (str): The query string.
+            matches (list): The matches for ``query``.
+
+        """
+        with self._lock:
+            if query not in self._entries:
+                if len(self._entries) >= self.maxsize:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._remove_query(evicted)
+                self._add_query(query)
+            self._entries[query] = matches
+
+    def invalidate(self, key):
+        """Evicts all cached queries which match ``key``.
+
+        Args:
+            key (str): A key which has been newly inserted into the trie.
+
+        """
+        with self._lock:
+            for query in list(self._matching_queries(key)):
+                del self._entries[query]
+                self._remove_query(query)
+
+    def clear(self):
+        """Evicts all cached queries"""
+        with self._lock:
+            self._entries.clear()
+            self._queries.clear()
+
+    def info(self):
+        """
+        Returns:
+            A :class:`.CacheInfo` tuple of the hit and miss counts along with
+            the maximum and current size of the cache.
+
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._entries)
+            )
+
+    def _add_query(self, query):
+        """Adds ``query`` to the trie of cached queries"""
+        node = self._queries
+        for char in query:
+            node = node.setdefault(char, {})
+        node[None] = query
+
+    def _remove_query(self, query):
+        """Removes ``query`` from the trie of cached queries, pruning nodes
+        which no longer lead to any query"""
+        path = []
+        node = self._queries
+        for char in query:
+            path.append((node, char))
+            node = node[char]
+        del node[None]
+
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    def _matching_queries(self, key):
+        """Yields the cached queries matching ``key`` taking into account
+        ambiguity"""
+        to_visit = [(0, self._queries)]
+        while to_visit:
+            depth, node = to_visit.pop()
+            if depth == len(key):
+                if None in node:
+                    yield node[None]
+                continue
+
+            char = key[depth]
+            if char == self.wildcard:
+                children = [
+                    child for prefix, child in node.items()
+                    if prefix is not None
+                ]
+            else:
+                children = [
+                    node[prefix] for prefix in (char, self.wildcard)
+                    if prefix in node
+                ]
+            to_visit.extend((depth + 1, child) for child in children)
+
+    def __len__(self):
+        """Returns the number of cached queries"""
+        return len(self._entries)
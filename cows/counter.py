@@ -0,0 +1,196 @@
+import array
+import heapq
+
+from .trie import Trie
+from .util import _EMPTY
+
+
+class Counter:
+    """Counts occurrences of potentially ambiguous strings.
+
+    This class is equivalent to a :class:`.Dict` using the default selector
+    and an updater which sums the old and new values, but is specialized for
+    that use.  Each distinct key is assigned an integer id which is stored in
+    the underlying :class:`.Trie` and the counts themselves are kept in a
+    compact array indexed by that id, so incrementing requires no Python-level
+    callbacks.  Counting is typically about twice as fast as with a
+    :class:`.Dict`, as most of the time is spent searching the trie for
+    matches in both cases.
+
+    Matches are found with a specialized traversal, so unlike a :class:`.Dict`
+    a counter does not support a match cache or a position index.
+
+    Args:
+        iterable (iterable): An optional iterable of keys to count, or a
+            mapping of keys to counts.
+        wildcard (char): The character representing ambiguity.
+
+    Example:
+        .. code-block:: python
+
+            import cows
+
+            c = cows.Counter(['ATNG', 'ATCN', 'ANNT', 'GTTC'], wildcard='N')
+            c.update(['GTTC', 'GTTC'])
+
+            print(c.most_common(2))
+
+        Produces:
+
+        .. code-block:: none
+
+            [('GTTC', 3), ('ATNG', 2)]
+
+    """
+    def __init__(self, iterable=None, wildcard='*'):
+        self.trie = Trie(wildcard=wildcard)
+        self.counts = array.array('q')
+        self._keys = []
+
+        if iterable:
+            self.update(iterable)
+
+    def add(self, key, count=1):
+        """Adds ``count`` to the count of ``key``.
+
+        If ``key`` matches one or more existing keys, the first in
+        lexicographic order is incremented as with the default
+        :class:`.Dict` selector.  Otherwise ``key`` is inserted.
+
+        Args:
+            key (str): The key to count.
+            count (int): The amount by which to increment.
+
+        """
+        match = self._select(key)
+        if match is None:
+            self.trie[key] = len(self.counts)
+            self.counts.append(count)
+            self._keys.append(key)
+        else:
+            self.counts[match] += count
+
+    def _select(self, key):
+        """Finds the id of the lexicographically first key matching ``key``.
+
+        This is a specialization of :meth:`.Trie.get_matches` which compares
+        matches by id as they are found rather than building each matching
+        key string and collecting every match.
+
+        Returns:
+            The id of the selected key, or ``None`` if there are no matches.
+
+        """
+        wildcard = self.trie.wildcard
+        last = len(key) - 1
+        keys = self._keys
+        best = None
+
+        to_visit = [(0, self.trie)]
+        while to_visit:
+            depth, node = to_visit.pop()
+            prefix = key[depth]
+            children = node.children
+            if prefix == wildcard:
+                matching = children.values()
+            elif wildcard in children:
+                matching = (children[wildcard],)
+                if prefix in children:
+                    matching += (children[prefix],)
+            elif prefix in children:
+                matching = (children[prefix],)
+            else:
+                continue
+
+            if depth < last:
+                to_visit.extend((depth + 1, child) for child in matching)
+                continue
+            for child in matching:
+                if child.value is not _EMPTY and (
+                        best is None or keys[child.value] < keys[best]):
+                    best = child.value
+        return best
+
+    def update(self, iterable):
+        """Counts all keys in ``iterable``.
+
+        Args:
+            iterable (iterable): Keys to count, each incrementing by one, or
+                a mapping (anything with ``items()``) of keys to counts.
+
+        """
+        if hasattr(iterable, 'items'):
+            for key, count in iterable.items():
+                self.add(key, count)
+        else:
+            for key in iterable:
+                self.add(key)
+
+    def most_common(self, n=None):
+        """Gets the most common keys and their counts.
+
+        Args:
+            n (int): The number of keys to return.  If ``None``, all keys are
+                returned.
+
+        Returns:
+            A list of ``(key, count)`` tuples in descending order of count.
+
+        """
+        if n is None:
+            ids = sorted(range(len(self.counts)),
+                         key=self.counts.__getitem__, reverse=True)
+        else:
+            ids = heapq.nlargest(n, range(len(self.counts)),
+                                 key=self.counts.__getitem__)
+        return [(self._keys[i], self.counts[i]) for i in ids]
+
+    def keys(self):
+        """
+        Returns:
+            The keys in the counter.
+
+        """
+        return iter(self._keys)
+
+    def values(self):
+        """
+        Returns:
+            The counts in the counter.
+
+        """
+        return iter(self.counts)
+
+    def items(self):
+        """
+        Returns:
+            ``(key, count)`` tuples for each key in the counter.
+
+        """
+        return zip(self._keys, self.counts)
+
+    def __iter__(self):
+        """Yields the keys in the counter"""
+        yield from self._keys
+
+    def __getitem__(self, key):
+        """Gets counts of keys matching ``key``.
+
+        Args:
+            key (str): The key string to match
+
+        Yields:
+            The counts of keys that match ``key``.  Order is not guaranteed.
+
+        """
+        yield from (
+            self.counts[m[1].value] for m in self.trie.get_matches(key)
+        )
+
+    def __len__(self):
+        """Returns the number of distinct keys in the counter."""
+        return len(self.counts)
+
+    def __repr__(self):
+        """Returns the representation of the counter"""
+        return 'cows.Counter()'
@@ -0,0 +1,228 @@
+import itertools
+import sys
+
+from .bulk import common_prefix_length
+from .trie import Trie
+
+
+class _Node:
+    """A state in a :class:`.Dawg`"""
+    __slots__ = ('children', 'final')
+
+    def __init__(self):
+        self.children = {}
+        self.final = False
+
+    def signature(self):
+        """Identifies the language accepted from this state.
+
+        Children are always already minimized when this is called, so two
+        states are equivalent exactly when their signatures are equal.
+
+        """
+        return (self.final, tuple(
+            (char, id(child)) for char, child in sorted(self.children.items())
+        ))
+
+
+def _trie_node_bytes():
+    """Estimates the memory used by one node of a :class:`.Trie`"""
+    node = Trie('A', True)
+    node.children['A'] = node
+    return (sys.getsizeof(node) + sys.getsizeof(node.__dict__) +
+            sys.getsizeof(node.children))
+
+
+class Dawg:
+    """A read-only set of strings stored as a minimized automaton.
+
+    A :class:`.Trie` shares common prefixes between strings, but a directed
+    acyclic word graph (DAWG) additionally shares common suffixes by merging
+    identical subtrees, which can greatly reduce memory for large, redundant
+    sets such as barcode whitelists.  It is built once, with the incremental
+    algorithm of Daciuk et al. over sorted input, and cannot be modified
+    afterwards.
+
+    Membership and :meth:`.get_matches` take into account wildcards in both
+    the query and the stored strings, as with :class:`.Set`.
+
+    Args:
+        iterable (iterable): The strings to store.  Empty strings, which
+            cannot be stored in a :class:`.Trie` either, are ignored.
+        wildcard (char): The character representing ambiguity.
+        presorted (bool): If ``iterable`` is already sorted.  If not, it is
+            sorted in memory.
+
+    Example:
+        .. code-block:: python
+
+            import cows
+
+            whitelist = cows.Dawg.from_set(cows.Set(
+                ['AACGT', 'CACGT', 'GACGT', 'TACGT'], wildcard='N'
+            ))
+
+            print('NACGT' in whitelist)
+            print(whitelist.memory_report()['nodes'])
+
+        Produces:
+
+        .. code-block:: none
+
+            True
+            6
+
+    """
+    def __init__(self, iterable=None, wildcard='*', presorted=False):
+        self.wildcard = wildcard
+        self.root = _Node()
+        self._size = 0
+        self._trie_nodes = 0
+        self._nodes = {}
+
+        if iterable:
+            self._build(iterable if presorted else sorted(iterable))
+
+    @classmethod
+    def from_set(cls, rset):
+        """Creates a DAWG holding the elements of a :class:`.Set`.
+
+        Args:
+            rset (Set): The set to copy.
+
+        Returns:
+            The new :class:`.Dawg`.
+
+        """
+        # Dict.keys() reads a snapshot under the lock of a concurrent set
+        return cls(
+            rset.dict.keys(sort=True), wildcard=rset.dict.trie.wildcard,
+            presorted=True
+        )
+
+    def _build(self, words):
+        """Inserts sorted ``words``, minimizing as suffixes are completed"""
+        # The path of states for the previous word which may not yet have
+        # been merged with an equivalent state
+        unchecked = []
+        previous = None
+
+        for word in words:
+            if not word or word == previous:
+                continue
+            if previous is not None and word < previous:
+                raise ValueError(
+                    'Input must be sorted: {} follows {}'.format(
+                        word, previous))
+
+            common = common_prefix_length(word, previous or '')
+            self._minimize(unchecked, common)
+
+            node = unchecked[-1][2] if unchecked else self.root
+            for char in word[common:]:
+                child = _Node()
+                node.children[char] = child
+                unchecked.append((node, char, child))
+                node = child
+            node.final = True
+
+            self._size += 1
+            self._trie_nodes += len(word) - common
+            previous = word
+
+        self._minimize(unchecked, 0)
+
+    def _minimize(self, unchecked, down_to):
+        """Merges unchecked states deeper than ``down_to`` with equivalent
+        registered states"""
+        while len(unchecked) > down_to:
+            parent, char, child = unchecked.pop()
+            signature = child.signature()
+            if signature in self._nodes:
+                parent.children[char] = self._nodes[signature]
+            else:
+                self._nodes[signature] = child
+
+    def get_matches(self, key, limit=None):
+        """Searches for strings matching ``key``.
+
+        Args:
+            key (str): The string for which to search for matches
+            limit (int): If set, stops searching after this many matches have
+                been found.
+
+        Yields:
+            The stored strings which match ``key``.
+
+        """
+        yield from itertools.islice(self._traverse(key), limit)
+
+    def _traverse(self, key):
+        """Walks the automaton yielding strings matching ``key``"""
+        if not key:
+            return
+
+        to_visit = [('', 0, self.root)]
+        while to_visit:
+            prev, depth, node = to_visit.pop()
+            prefix = key[depth]
+            if prefix == self.wildcard:
+                matching = node.children.items()
+            else:
+                matching = [
+                    (char, node.children[char])
+                    for char in (prefix, self.wildcard)
+                    if char in node.children
+                ]
+
+            for char, child in matching:
+                if depth + 1 < len(key):
+                    to_visit.append((prev + char, depth + 1, child))
+                elif child.final:
+                    yield prev + char
+
+    def memory_report(self):
+        """Reports the memory saved compared to an equivalent trie.
+
+        Returns:
+            A dictionary with the number of ``nodes`` in the DAWG, the number
+            of ``trie_nodes`` a :class:`.Trie` holding the same strings would
+            have, the estimated ``bytes`` used by each in ``dawg_bytes`` and
+            ``trie_bytes``, and the fraction of memory ``saved``.
+
+        """
+        nodes = [self.root] + list(self._nodes.values())
+        dawg_bytes = sum(
+            sys.getsizeof(node) + sys.getsizeof(node.children)
+            for node in nodes
+        )
+        trie_bytes = (self._trie_nodes + 1) * _trie_node_bytes()
+        return {
+            'nodes': len(nodes),
+            'trie_nodes': self._trie_nodes + 1,
+            'dawg_bytes': dawg_bytes,
+            'trie_bytes': trie_bytes,
+            'saved': 1 - dawg_bytes / trie_bytes,
+        }
+
+    def __contains__(self, key):
+        """Returns if ``key`` is in the DAWG taking into account ambiguity"""
+        return next(self.get_matches(key, limit=1), None) is not None
+
+    def __iter__(self):
+        """Yields the strings in the DAWG in lexicographic order"""
+        to_visit = [('', self.root)]
+        while to_visit:
+            prev, node = to_visit.pop()
+            if node.final:
+                yield prev
+            for char, child in sorted(node.children.items(), reverse=True):
+                to_visit.append((prev + char, child))
+
+    def __len__(self):
+        """Returns the number of strings in the DAWG"""
+        return self._size
+
+    def __repr__(self):
+        """Returns the representation of the DAWG"""
+        return 'cows.Dawg()'
@@ -1,4 +1,81 @@
+import asyncio
+import contextlib
+import itertools
+
+from .bulk import DEFAULT_CHUNK_SIZE, external_sort
+from .lock import RWLock
+from .readers import read_sequences
 from .trie import Trie
+from .util import _EMPTY
+from .views import SubView
+
+
+def most_specific(matches):
+    """A :class:`.Dict` selector choosing the match with the fewest wildcards.
+
+    Ties are broken by choosing the first match in lexicographic order.  When
+    passed as the ``selector`` of a :class:`.Dict`, matches are found with
+    :meth:`.Trie.get_best_matches` so only the selected match is searched for
+    rather than collecting every match.  This is signalled by the function's
+    ``best_first`` attribute.  The best-first search does not use the
+    trie's match cache or position index, nor the dictionary's
+    ``scan_ratio``.
+
+    Args:
+        matches (iterable): ``(key, node)`` matches as yielded by
+            :meth:`.Trie.get_matches`.
+
+    Returns:
+        The most specific ``(key, node)`` match.
+
+    """
+    return min(matches, key=lambda m: (m[0].count(m[1].wildcard), m[0]))
+
+
+most_specific.best_first = True
+
+
+def merge_all(dicts):
+    """Merges many dictionaries with a balanced tree reduction.
+
+    Dictionaries are merged pairwise with :meth:`.Dict.merge`, then the
+    results are merged pairwise, and so on.  Compared to merging each into
+    one accumulator, this keeps the dictionaries being merged at each step of
+    similar size so more paths can be combined directly.
+
+    Example:
+        .. code-block:: python
+
+            partials = pool.map(count_chunk, chunks)
+            counts = cows.merge_all(partials)
+
+    Args:
+        dicts (iterable): The :class:`.Dict` objects to merge.  The first
+            dictionary of each pair is modified in place.
+
+    Returns:
+        The merged :class:`.Dict`.
+
+    Raises:
+        ValueError
+            If ``dicts`` is empty.
+
+    """
+    dicts = list(dicts)
+    if not dicts:
+        raise ValueError('At least one dictionary is required')
+
+    while len(dicts) > 1:
+        for first, second in zip(dicts[::2], dicts[1::2]):
+            first.merge(second)
+        dicts = dicts[::2]
+    return dicts[0]
+
+
+@contextlib.contextmanager
+def _unlocked():
+    """A context manager which does nothing, used when not concurrent"""
+    yield
 
 
 class Dict:
@@ -18,7 +95,15 @@ class Dict:
 
             Must accept one argument, an iterable of ``(key, value)`` matches,
             and return a single element from the iterator that will be updated
-            with ``updater``.
+            with ``updater``.  :func:`.most_specific` is provided to select
+            the match with the fewest wildcards.
+
+            A selector which always chooses the first match yielded by
+            :meth:`.Trie.get_best_matches` may be marked by setting its
+            ``best_first`` attribute to ``True``, as
+            :func:`.most_specific` is.  It is then passed only that match,
+            found by a best-first search which bypasses the match cache, the
+            position index, and ``scan_ratio``.
         updater (func): Called when ``__setitem__`` is called with `key` and
             ``value`` and a (possibly ambiguous) match to `key` exists.
 
@@ -28,6 +113,26 @@ class Dict:
             be passed the ``value`` passed to ``__setitem__``.
 
             Returns the value to set the value associated with ``match`` to.
+        concurrent (bool): If true, guards the dictionary with a
+            :class:`.RWLock` so it may be shared between threads.  The
+            match-select-update sequence of ``__setitem__`` runs atomically
+            while lookups and iteration still run in parallel.
+
+            Iteration then works on a snapshot taken under the lock when it
+            is called.  :meth:`.keys`, :meth:`.values`, and :meth:`.items`
+            return the views of a builtin ``dict`` copy of the items rather
+            than live :class:`.TrieView` objects, and :meth:`.subview` views
+            a copy of the subtree.  Both kinds of view implement the same
+            :mod:`collections.abc` interfaces, but snapshots do not reflect
+            later writes.
+        wal (WriteAheadLog): If set, the dictionary is first recovered from
+            this :class:`.WriteAheadLog` and then every write is appended to
+            it after ``selector`` and ``updater`` have been applied, with
+            checkpoints written as they come due.
+        scan_ratio (float): If set, lookups for which
+            :meth:`.Trie.estimate_matches` predicts at least this fraction of
+            all keys will match use :meth:`.Trie.scan_matches` instead of
+            traversing the trie.
         **kwargs: Passed to underlying Trie
 
 
@@ -102,7 +207,8 @@ class Dict:
             GHF --> 8
 
     """
-    def __init__(self, selector=None, updater=None, **kwargs):
+    def __init__(self, selector=None, updater=None, concurrent=False,
+                 wal=None, scan_ratio=None, **kwargs):
         initialize = kwargs.pop('initialize', None)
 
         def _default_selector(matches):
@@ -111,37 +217,277 @@ class Dict:
         self.selector = selector or _default_selector
         self.updater = updater
         self.trie = Trie(**kwargs)
+        self.lock = RWLock() if concurrent else None
+        self.wal = wal
+        self.scan_ratio = scan_ratio
+
+        if wal is not None:
+            # Logged values are already resolved so they bypass __setitem__
+            self.trie.bulk_load(wal.recover())
 
         # This needs to override the same loop in Trie because
         # __setitem__ processes calls before calling the same method in
         # Trie
         if initialize:
-            for init_key, init_val in initialize:
-                self[init_key] = init_val
+            initialize = list(initialize)
+            if any(self.trie.wildcard in k for k, _ in initialize):
+                for init_key, init_val in initialize:
+                    self[init_key] = init_val
+            else:
+                # Without wildcards, only identical keys can match each other
+                # so the order of distinct keys is irrelevant
+                self.bulk_load(initialize)
+
+    @classmethod
+    def from_file(cls, source, value=1, fmt=None, progress=None, **kwargs):
+        """Creates a dictionary from the sequences in a file.
+
+        Args:
+            source (str or file): A path, optionally gzip compressed, or an
+                open text file object.
+            value (obj or func): The value to set for each sequence.  If
+                callable, it is called with the sequence to get the value.
+            fmt (str): One of ``plain``, ``fasta``, or ``fastq``.  If
+                ``None``, the format is detected from the first line.
+            progress (func): If set, called periodically with a
+                :class:`.Progress` while reading.
+            **kwargs: Passed to the constructor, e.g. ``updater``.
+
+        Returns:
+            The new :class:`.Dict`.
+
+        """
+        rdict = cls(**kwargs)
+        rdict.update_from_stream(
+            source, value=value, fmt=fmt, progress=progress
+        )
+        return rdict
+
+    def update_from_stream(self, source, value=1, fmt=None, progress=None):
+        """Sets a value for each sequence read from ``source``.
+
+        Sequences are streamed with :func:`.read_sequences` and set as they
+        are read, applying ``selector`` and ``updater`` as with
+        ``__setitem__``.
+
+        Args:
+            source (str or file): A path, optionally gzip compressed, or an
+                open text file object.
+            value (obj or func): The value to set for each sequence.  If
+                callable, it is called with the sequence to get the value.
+            fmt (str): One of ``plain``, ``fasta``, or ``fastq``.  If
+                ``None``, the format is detected from the first line.
+            progress (func): If set, called periodically with a
+                :class:`.Progress` while reading.
+
+        """
+        for key in read_sequences(source, fmt=fmt, progress=progress):
+            self[key] = value(key) if callable(value) else value
+
+    def bulk_load(self, items, presorted=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Sets many key/value pairs in a single pass over the trie.
+
+        Items are sorted by key (stably, so repeated keys keep their relative
+        order) and applied as with ``__setitem__``.  When the dictionary is
+        empty, runs of identical keys without wildcards are combined with
+        ``updater`` directly and loaded with :meth:`.Trie.bulk_load` since
+        such keys can only match each other.  Keys containing wildcards are
+        then set with the full match-select-update logic in sorted order.
+
+        Note:
+            Items with different keys are not applied in the order given, so
+            the result may differ from setting them one at a time when keys
+            contain wildcards.
+
+        Args:
+            items (iterable): ``(key, value)`` pairs to set.
+            presorted (bool): If ``items`` are already sorted by key.  If
+                not, they are sorted with :func:`.external_sort`.
+            chunk_size (int): The maximum number of items held in memory
+                while sorting.
+
+        Raises:
+            ValueError
+                If ``presorted`` is set but ``items`` are not sorted.  Items
+                before the first out of order key will already have been set.
 
-    def keys(self):
         """
+        if not presorted:
+            items = external_sort(
+                items, key=lambda item: item[0], chunk_size=chunk_size
+            )
+
+        with self._locked(write=True):
+            if self.trie.children:
+                for key, value in items:
+                    self._set(key, value)
+                return
+
+            deferred = []
+            self.trie.bulk_load(self._combine(items, deferred), presorted=True)
+            self._checkpoint_if_due()
+            for key, value in deferred:
+                self._set(key, value)
+
+    def _combine(self, items, deferred):
+        """Folds runs of identical wildcard-free keys with ``updater``.
+
+        Items whose keys contain wildcards are appended to ``deferred``.
+
+        """
+        previous = None
+        for key, group in itertools.groupby(items, key=lambda item: item[0]):
+            # Repeated keys must be adjacent to be combined
+            if previous is not None and key < previous:
+                raise ValueError(
+                    'Items must be sorted: {} follows {}'.format(
+                        key, previous))
+            previous = key
+
+            if self.trie.wildcard in key:
+                deferred.extend(group)
+                continue
+
+            _, value = next(group)
+            for _, new_value in group:
+                value = self.updater(key, value, new_value) if (
+                    self.updater) else new_value
+            if self.wal is not None:
+                self.wal.append(key, value)
+            yield key, value
+
+    def estimate_matches(self, key):
+        """Estimates the number of keys matching ``key``.
+
+        See :meth:`.Trie.estimate_matches`.
+
+        Args:
+            key (str): The key string to match
+
+        Returns:
+            The estimated number of matches as a float.
+
+        """
+        with self._locked():
+            return self.trie.estimate_matches(key)
+
+    def _find(self, key, limit=None):
+        """Gets matches for ``key`` by traversal or scan as ``scan_ratio``
+        dictates"""
+        size = len(self.trie)
+        if self.scan_ratio is not None and size and (
+                self.trie.estimate_matches(key) >= self.scan_ratio * size):
+            return itertools.islice(self.trie.scan_matches(key), limit)
+        return self.trie.get_matches(key, limit=limit)
+
+    def _locked(self, write=False):
+        """Gets a context manager holding the lock if concurrent"""
+        if self.lock is None:
+            return _unlocked()
+        return self.lock.write() if write else self.lock.read()
+
+    def _snapshot(self, prefix, sort):
+        """Copies the items under ``prefix`` into a ``dict`` under the read
+        lock"""
+        with self.lock.read():
+            return dict(self.trie.items(
+                extract_values=True, prefix=prefix, sort=sort
+            ))
+
+    def keys(self, prefix='', sort=False):
+        """
+        Args:
+            prefix (str): If set, only keys starting with ``prefix`` are
+                included.
+            sort (bool): If true, keys are in lexicographic order.
+
         Returns:
-            The keys in the dictionary.
+            A :class:`.KeysView` of the keys in the dictionary, or a view of
+            a snapshot if the dictionary is ``concurrent``.
+
+        """
+        if self.lock is not None:
+            return self._snapshot(prefix, sort).keys()
+        return self.trie.keys(prefix=prefix, sort=sort)
+
+    def values(self, prefix='', sort=False):
+        """
+        Args:
+            prefix (str): If set, only values of keys starting with
+                ``prefix`` are included.
+            sort (bool): If true, values are in lexicographic order of their
+                keys.
+
+        Returns:
+            A :class:`.ValuesView` of the values in the dictionary, or a view
+            of a snapshot if the dictionary is ``concurrent``.
+
+        """
+        if self.lock is not None:
+            return self._snapshot(prefix, sort).values()
+        return self.trie.values(extract_values=True, prefix=prefix, sort=sort)
 
+    def items(self, prefix='', sort=False):
         """
-        return self.trie.keys()
+        Args:
+            prefix (str): If set, only items with keys starting with
+                ``prefix`` are included.
+            sort (bool): If true, items are in lexicographic order of their
+                keys.
+
+        Returns:
+            An :class:`.ItemsView` of ``(key, value)`` tuples for each
+            association in the dictionary, or a view of a snapshot if the
+            dictionary is ``concurrent``.
 
-    def values(self):
         """
+        if self.lock is not None:
+            return self._snapshot(prefix, sort).items()
+        return self.trie.items(extract_values=True, prefix=prefix, sort=sort)
+
+    def subview(self, prefix, sort=False):
+        """Gets a view of the part of the dictionary under ``prefix``.
+
+        Only the subtree of the trie under ``prefix`` is walked when iterating
+        the view, making it suitable for exporting a large dictionary in
+        pages.
+
+        Example:
+            .. code-block:: python
+
+                for prefix in ('A', 'C', 'G', 'T'):
+                    page = my_dict.subview(prefix, sort=True)
+                    print(prefix, len(page), list(page.items()))
+
+        Args:
+            prefix (str): Only keys starting with this prefix are included.
+            sort (bool): If true, keys are iterated in lexicographic order.
+
         Returns:
-            The values in the dictionary.
+            A :class:`.SubView` with ``keys()``, ``values()``, and ``items()``
+            views restricted to ``prefix``.  If the dictionary is
+            ``concurrent``, it views a copy of the subtree taken under the
+            lock.
 
         """
-        return self.trie.values(extract_values=True)
+        if self.lock is None:
+            return SubView(self.trie, prefix, sort)
+
+        snapshot = Trie(wildcard=self.trie.wildcard)
+        with self.lock.read():
+            snapshot.bulk_load(self.trie.items(
+                extract_values=True, prefix=prefix, sort=True
+            ), presorted=True)
+        return SubView(snapshot, prefix, sort)
 
-    def items(self):
+    def cache_info(self):
         """
         Returns:
-            ``(key, value)`` tuples for each association in the dictionary.
+            The :class:`.CacheInfo` of the underlying trie's match cache, or
+            ``None`` if caching is disabled.
 
         """
-        return self.trie.items(extract_values=True)
+        return self.trie.cache_info()
 
     def __iter__(self):
         """Yields the keys in the dictionary"""
@@ -159,13 +505,154 @@ class Dict:
             value (obj): The value to set
 
         """
-        matches = [m for m in self.trie.get_matches(key)]
+        with self._locked(write=True):
+            self._set(key, value)
+
+    def _set(self, key, value):
+        """Performs the unlocked match-select-update for ``__setitem__``"""
+        if getattr(self.selector, 'best_first', False):
+            # The best-first walk is its own plan, so the cache, index and
+            # scan_ratio used by _find do not apply
+            matches = list(self.trie.get_best_matches(key, limit=1))
+        else:
+            matches = [m for m in self._find(key)]
         if matches:
             key, current_value = self.selector(matches)
             if self.updater:
                 value = self.updater(key, current_value.value, value)
+        self._store(key, value)
+
+    def _store(self, key, value):
+        """Sets the resolved ``value`` of ``key`` in the trie and log"""
         self.trie[key] = value
 
+        if self.wal is not None:
+            self.wal.append(key, value)
+            self._checkpoint_if_due()
+
+    def merge(self, other):
+        """Merges the items of another dictionary into this one.
+
+        The result is the same as setting each item of ``other`` in this
+        dictionary with ``__setitem__`` in some order, but the tries of both
+        dictionaries are walked together so most items are combined directly:
+
+        * Where a path exists in both and neither has a wildcard at that
+          level, an item of ``other`` can only match the identical key in this
+          dictionary, so ``updater`` is applied to the pair directly.
+        * Where a subtree of ``other`` has no counterpart here, its items
+          cannot match anything and are copied.
+        * Only items under a wildcard in either trie, where matches may cross
+          branches, are set with the full match-select-update logic.  This is
+          done after all other items have been combined.
+
+        This relies on the keys of ``other`` not matching each other, which
+        holds for any :class:`.Dict` built with ``__setitem__``.
+
+        If either dictionary is ``concurrent``, this one is locked for writing
+        and ``other`` for reading.  The locks are always taken in the same
+        order so merges in opposite directions cannot deadlock.
+
+        Args:
+            other (Dict): The dictionary to merge into this one.  It is not
+                modified.
+
+        Raises:
+            ValueError
+                If ``other`` is this dictionary.
+
+        """
+        if other is self:
+            raise ValueError('Cannot merge a dictionary into itself')
+
+        first, second = sorted((self, other), key=id)
+        with first._locked(write=first is self), \
+                second._locked(write=second is self):
+            if other.trie.wildcard != self.trie.wildcard:
+                # other is already locked so its items are read directly
+                for key, value in other.trie.items(extract_values=True):
+                    self._set(key, value)
+                return
+
+            deferred = []
+            to_visit = [(self.trie, other.trie, '')]
+            while to_visit:
+                node, other_node, path = to_visit.pop()
+                ambiguous = self.trie.wildcard in node.children
+
+                for prefix, other_child in other_node.children.items():
+                    if ambiguous or prefix == self.trie.wildcard:
+                        deferred.extend(
+                            (path + key, value) for key, value in
+                            other_child.items(extract_values=True)
+                        )
+                        continue
+
+                    child = node.children.get(prefix)
+                    if child is None:
+                        for key, value in other_child.items(
+                                extract_values=True):
+                            self._store(path + key, value)
+                        continue
+
+                    if other_child.value is not _EMPTY:
+                        self._merge_value(
+                            path + prefix, child, other_child.value)
+                    to_visit.append((child, other_child, path + prefix))
+
+            for key, value in deferred:
+                self._set(key, value)
+
+    def _merge_value(self, key, node, value):
+        """Combines ``value`` into ``node`` which is known to be the only
+        possible match for ``key``"""
+        if node.value is _EMPTY:
+            self._store(key, value)
+            return
+
+        # Updating an existing key in place needs none of the bookkeeping of
+        # inserting through the trie
+        node.value = self.updater(
+            key, node.value, value) if self.updater else value
+        if self.wal is not None:
+            self.wal.append(key, node.value)
+            self._checkpoint_if_due()
+
+    def update(self, other):
+        """Sets all items of ``other`` in this dictionary.
+
+        Args:
+            other: A :class:`.Dict`, which is combined with :meth:`.merge`,
+                a mapping, or an iterable of ``(key, value)`` pairs, which are
+                each set with ``__setitem__``.
+
+        """
+        if isinstance(other, Dict):
+            self.merge(other)
+            return
+
+        items = other.items() if hasattr(other, 'items') else other
+        for key, value in items:
+            self[key] = value
+
+    def checkpoint(self):
+        """Writes a checkpoint of the dictionary to its write-ahead log.
+
+        Raises:
+            ValueError
+                If the dictionary was not created with a ``wal``.
+
+        """
+        if self.wal is None:
+            raise ValueError('Dictionary has no write-ahead log')
+        with self._locked(write=True):
+            self.wal.checkpoint(self.trie.items(extract_values=True))
+
+    def _checkpoint_if_due(self):
+        """Writes a checkpoint if one is due, without locking"""
+        if self.wal is not None and self.wal.checkpoint_due():
+            self.wal.checkpoint(self.trie.items(extract_values=True))
+
     def __getitem__(self, key):
         """Gets items matching ``key``.
 
@@ -176,11 +663,99 @@ class Dict:
             The values that match ``key``.  Order is not guaranteed.
 
         """
-        yield from (m[1].value for m in self.trie.get_matches(key))
+        yield from self.matches(key)
+
+    def matches(self, key, limit=None):
+        """Gets up to ``limit`` items matching ``key``.
+
+        Unlike ``dict.get``, this yields the values of every match rather
+        than returning one value.  Use :meth:`.first` to get a single value
+        with a default.
+
+        Args:
+            key (str): The key string to match
+            limit (int): If set, the maximum number of values to yield.
+                Searching stops as soon as this many matches are found.
+
+        Yields:
+            The values that match ``key``.  Order is not guaranteed.
+
+        """
+        if self.lock is None:
+            yield from (m[1].value for m in self._find(key, limit=limit))
+            return
+
+        # The search itself, including any estimate for scan_ratio, must run
+        # under the lock
+        with self.lock.read():
+            values = [m[1].value for m in self._find(key, limit=limit)]
+        yield from values
+
+    async def amatches(self, key, limit=None, **kwargs):
+        """Asynchronously gets up to ``limit`` items matching ``key``.
+
+        This is the asynchronous version of :meth:`.matches`.  See
+        :meth:`.Trie.aget_matches` for how the search cooperates with the
+        event loop.  If the dictionary is ``concurrent``, the search must
+        hold the lock, so it is instead run with :meth:`.matches` in
+        ``executor``, or the event loop's default executor if none is given.
+
+        Args:
+            key (str): The key string to match
+            limit (int): If set, the maximum number of values to yield.
+            **kwargs: Passed to :meth:`.Trie.aget_matches`
+
+        Yields:
+            The values that match ``key``.  Order is not guaranteed.
+
+        """
+        if self.lock is not None:
+            # Waiting for the lock on the event loop would block other tasks
+            values = await asyncio.get_event_loop().run_in_executor(
+                kwargs.get('executor'),
+                lambda: list(self.matches(key, limit=limit))
+            )
+            for value in values:
+                yield value
+            return
+
+        async for _, node in self.trie.aget_matches(key, limit=limit,
+                                                    **kwargs):
+            yield node.value
+
+    def first(self, key, default=None):
+        """Gets the value of the first match found for ``key``.
+
+        Args:
+            key (str): The key string to match
+            default (obj): The value to return if there are no matches.
+
+        Returns:
+            The value of a key matching ``key``, or ``default`` if no such key
+            exists.
+
+        """
+        match = self.get_first_match(key)
+        return match[1] if match else default
+
+    def get_first_match(self, key):
+        """Gets the first item found matching ``key``.
+
+        Args:
+            key (str): The key string to match
+
+        Returns:
+            A ``(key, value)`` tuple for a key matching ``key``, or ``None``
+            if no such key exists.
+
+        """
+        with self._locked():
+            match = self.trie.get_first_match(key)
+        return (match[0], match[1].value) if match else None
 
     def __len__(self):
         """Returns the number of elements in the dictionary."""
-        return len([l for l in self.values()])
+        return len(self.trie)
 
     def __repr__(self):
         """Returns the representation of the dictionary"""
@@ -0,0 +1,107 @@
+import collections
+
+
+# The number of ids stored per bitmap chunk.  Chunks are Python ints, so
+# setting a bit copies at most this many bits.
+CHUNK_BITS = 4096
+
+
+def _bitmap_add(bitmap, key_id):
+    """Sets the bit for ``key_id`` in a chunked bitmap"""
+    chunk, offset = divmod(key_id, CHUNK_BITS)
+    bitmap[chunk] = bitmap.get(chunk, 0) | (1 << offset)
+
+
+def _bitmap_ids(bitmap):
+    """Yields the ids set in a chunked bitmap in ascending order"""
+    for chunk in sorted(bitmap):
+        bits = bitmap[chunk]
+        base = chunk * CHUNK_BITS
+        while bits:
+            low = bits & -bits
+            yield base + low.bit_length() - 1
+            bits ^= low
+
+
+class PositionIndex:
+    """An inverted index from (position, character) to the keys containing
+    them.
+
+    Each stored key is assigned an integer id.  For every position, the index
+    keeps a compressed bitmap of the ids of keys with each character at that
+    position along with a bitmap of the ids of keys with a wildcard there.
+    Bitmaps are split into chunks of :data:`.CHUNK_BITS` ids so sparse
+    bitmaps only store the chunks containing set bits.
+
+    Keys matching a query are those of the same length which, at every
+    position where the query has a concrete character, have either that
+    character or a wildcard.  The cost of a query therefore scales with the
+    number of concrete characters it contains rather than the size of the
+    trie, making the index well suited to queries which are mostly wildcards.
+
+    Args:
+        wildcard (char): The character representing ambiguity.
+
+    """
+    def __init__(self, wildcard='*'):
+        self.wildcard = wildcard
+        self.entries = []
+        self._lengths = collections.defaultdict(dict)
+        self._chars = []
+        self._wildcards = []
+
+    def add(self, key, node):
+        """Adds a key to the index.
+
+        Args:
+            key (str): The key, which must not already be in the index.
+            node (Trie): The trie node holding the value of ``key``.
+
+        """
+        key_id = len(self.entries)
+        self.entries.append((key, node))
+        _bitmap_add(self._lengths[len(key)], key_id)
+
+        while len(self._chars) < len(key):
+            self._chars.append(collections.defaultdict(dict))
+            self._wildcards.append({})
+
+        for position, char in enumerate(key):
+            if char == self.wildcard:
+                _bitmap_add(self._wildcards[position], key_id)
+            else:
+                _bitmap_add(self._chars[position][char], key_id)
+
+    def get_matches(self, key):
+        """Searches the index for keys matching ``key``.
+
+        Args:
+            key (str): The string for which to search for matches
+
+        Yields:
+            ``(key, node)`` tuples for keys that match ``key``.
+
+        """
+        result = dict(self._lengths.get(len(key), {}))
+        for position, char in enumerate(key):
+            if not result:
+                return
+            if char == self.wildcard:
+                continue
+
+            chars = self._chars[position].get(char, {})
+            wildcards = self._wildcards[position]
+            result = {
+                chunk: remaining for chunk, remaining in (
+                    (chunk, bits & (
+                        chars.get(chunk, 0) | wildcards.get(chunk, 0)))
+                    for chunk, bits in result.items()
+                ) if remaining
+            }
+
+        for key_id in _bitmap_ids(result):
+            yield self.entries[key_id]
+
+    def __len__(self):
+        """Returns the number of keys in the index"""
+        return len(self.entries)
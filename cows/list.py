@@ -1,3 +1,4 @@
+from .readers import read_sequences
 from .trie import Trie
 
 
@@ -33,9 +34,45 @@ class List:
     """
     def __init__(self, iterable=None):
         self.list = list(iterable) if iterable else []
-        self.trie = Trie(initialize=[
-            (element, True) for element in self.list
-        ] if iterable else None)
+        self.trie = Trie()
+        self.trie.bulk_load((element, True) for element in self.list)
+
+    @classmethod
+    def from_file(cls, source, fmt=None, progress=None):
+        """Creates a list from the sequences in a file.
+
+        Args:
+            source (str or file): A path, optionally gzip compressed, or an
+                open text file object.
+            fmt (str): One of ``plain``, ``fasta``, or ``fastq``.  If
+                ``None``, the format is detected from the first line.
+            progress (func): If set, called periodically with a
+                :class:`.Progress` while reading.
+
+        Returns:
+            The new :class:`.List`.
+
+        """
+        rlist = cls()
+        rlist.update_from_stream(source, fmt=fmt, progress=progress)
+        return rlist
+
+    def update_from_stream(self, source, fmt=None, progress=None):
+        """Appends each sequence read from ``source`` to the list.
+
+        Sequences are streamed with :func:`.read_sequences` and inserted as
+        they are read.
+
+        Args:
+            source (str or file): A path, optionally gzip compressed, or an
+                open text file object.
+            fmt (str): One of ``plain``, ``fasta``, or ``fastq``.  If
+                ``None``, the format is detected from the first line.
+            progress (func): If set, called periodically with a
+                :class:`.Progress` while reading.
+
+        """
+        self.extend(read_sequences(source, fmt=fmt, progress=progress))
 
     def __contains__(self, key):
         """Returns if `key` is in the list taking into account ambiguity"""
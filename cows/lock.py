@@ -0,0 +1,61 @@
+import contextlib
+import threading
+
+
+class RWLock:
+    """A reader-writer lock allowing parallel readers and exclusive writers.
+
+    Any number of threads may hold the lock for reading at once, while a
+    writer waits for all readers to finish and then holds the lock alone.
+    Waiting writers take priority over new readers so a steady stream of
+    lookups cannot starve insertions.
+
+    Example:
+
+        .. code-block:: python
+
+            lock = cows.lock.RWLock()
+
+            with lock.read():
+                ...  # Shared access
+
+            with lock.write():
+                ...  # Exclusive access
+
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextlib.contextmanager
+    def read(self):
+        """Acquires the lock for shared (read) access"""
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        """Acquires the lock for exclusive (write) access"""
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
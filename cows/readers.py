@@ -0,0 +1,195 @@
+import contextlib
+import gzip
+import io
+import itertools
+import time
+
+
+FORMATS = ('plain', 'fasta', 'fastq')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+class Progress:
+    """Tracks the progress of reading sequences from a source.
+
+    An instance is passed to the ``progress`` callback of
+    :func:`.read_sequences` periodically while reading and once more when
+    reading completes.
+
+    Attributes:
+        records (int): The number of sequences read so far.
+        bases (int): The total length of the sequences read so far.
+        done (bool): If reading has completed.
+
+    """
+    def __init__(self):
+        self.records = 0
+        self.bases = 0
+        self.done = False
+        self._start = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """The number of seconds since reading started"""
+        return time.monotonic() - self._start
+
+    @property
+    def rate(self):
+        """The number of sequences read per second"""
+        elapsed = self.elapsed
+        return self.records / elapsed if elapsed else 0.0
+
+    def __repr__(self):
+        """Returns the representation of the progress"""
+        return 'cows.readers.Progress({} records, {:.0f}/s)'.format(
+            self.records, self.rate)
+
+
+@contextlib.contextmanager
+def _open(source, chunk_size):
+    """Opens ``source`` for buffered text reading.
+
+    Paths to gzip compressed files are detected by their magic bytes and
+    decompressed transparently.  Objects which are already file-like are
+    used as-is and not closed.
+
+    """
+    if hasattr(source, 'read'):
+        yield source
+        return
+
+    with open(source, 'rb') as fh:
+        compressed = fh.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+
+    if compressed:
+        handle = io.TextIOWrapper(io.BufferedReader(
+            gzip.GzipFile(source), buffer_size=chunk_size
+        ), encoding='utf-8')
+    else:
+        handle = open(source, 'r', buffering=chunk_size, encoding='utf-8')
+
+    with handle:
+        yield handle
+
+
+def _detect_format(first_line):
+    """Guesses the format of a source from its first non-blank line"""
+    if first_line.startswith('>'):
+        return 'fasta'
+    if first_line.startswith('@'):
+        return 'fastq'
+    return 'plain'
+
+
+def _parse_plain(lines):
+    """Yields each non-empty line as a sequence"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _parse_fasta(lines):
+    """Yields sequences from FASTA records, joining wrapped lines"""
+    parts = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('>'):
+            if parts:
+                yield ''.join(parts)
+            parts = []
+        elif line:
+            parts.append(line)
+    if parts:
+        yield ''.join(parts)
+
+
+def _parse_fastq(lines):
+    """Yields sequences from four line FASTQ records"""
+    lines = iter(lines)
+    for header in lines:
+        if not header.strip():
+            continue
+        if not header.startswith('@'):
+            raise ValueError(
+                'Malformed FASTQ record header {}'.format(header.strip()))
+        sequence = next(lines, '').strip()
+        # Skip the separator and quality lines
+        next(lines, None)
+        next(lines, None)
+        yield sequence
+
+
+_PARSERS = {
+    'plain': _parse_plain,
+    'fasta': _parse_fasta,
+    'fastq': _parse_fastq,
+}
+
+
+def read_sequences(source, fmt=None, chunk_size=1 << 20, progress=None,
+                   report_every=100000):
+    """Lazily reads sequences from a plain text, FASTA, or FASTQ source.
+
+    The source is read in large buffered chunks and sequences are yielded one
+    at a time so memory use is bounded regardless of the size of the source.
+
+    Example:
+
+        .. code-block:: python
+
+            import cows
+
+            def report(progress):
+                print(progress)
+
+            s = cows.Set(wildcard='N')
+            s.update_from_stream('reads.fastq.gz', progress=report)
+
+    Args:
+        source (str or file): A path, optionally gzip compressed, or an open
+            text file object.
+        fmt (str): One of ``plain`` (one sequence per line), ``fasta``, or
+            ``fastq``.  If ``None``, the format is detected from the first
+            line.
+        chunk_size (int): The size, in bytes, of the read buffer.
+        progress (func): If set, called with a :class:`.Progress` every
+            ``report_every`` sequences and when reading completes.
+        report_every (int): The number of sequences between calls to
+            ``progress``.
+
+    Yields:
+        Each sequence in ``source``.
+
+    Raises:
+        ValueError
+            If ``fmt`` is not a known format or a FASTQ record is malformed.
+
+    """
+    if fmt is not None and fmt not in FORMATS:
+        raise ValueError(
+            'Format must be one of {}, not {}'.format(', '.join(FORMATS), fmt))
+
+    status = Progress()
+    with _open(source, chunk_size) as handle:
+        # Leading blank lines are kept so the parser sees the whole source
+        leading = []
+        for line in handle:
+            leading.append(line)
+            if line.strip():
+                break
+        lines = itertools.chain(leading, handle)
+        parser = _PARSERS[fmt or _detect_format(
+            leading[-1] if leading else '')]
+
+        for sequence in parser(lines):
+            status.records += 1
+            status.bases += len(sequence)
+            if progress and status.records % report_every == 0:
+                progress(status)
+            yield sequence
+
+    status.done = True
+    if progress:
+        progress(status)
@@ -1,4 +1,7 @@
+import asyncio
+
 from .dictionary import Dict
+from .readers import read_sequences
 
 
 class Set:
@@ -6,13 +9,16 @@ class Set:
 
     This class provides a basic implementation of the ``set``, a group of
     distinct (unique) values.  Uniqueness is checked based on ambiguous strings
-    so ``ABC*`` and ``*BCD`` would be considered equivalent.
+    so ``ABC*`` and ``*BCD`` would be considered equivalent.  Likewise, ``in``
+    checks for an element matching the key, so ``'A*C' in Set(['ABC'])`` is
+    ``True``.
 
 
     Args:
         iterable (iterable): An optional set of elements with which to populate
         the set.
-        **kwargs: Passed to underlying Trie
+        **kwargs: Passed to underlying :class:`.Dict`, e.g. ``concurrent``
+            for thread-safe use, and from there to the Trie
 
     Example:
         .. code-block:: python
@@ -41,6 +47,45 @@ class Set:
             (element, True) for element in iterable
         ] if iterable else None, **kwargs)
 
+    @classmethod
+    def from_file(cls, source, fmt=None, progress=None, **kwargs):
+        """Creates a set from the sequences in a file.
+
+        Args:
+            source (str or file): A path, optionally gzip compressed, or an
+                open text file object.
+            fmt (str): One of ``plain``, ``fasta``, or ``fastq``.  If
+                ``None``, the format is detected from the first line.
+            progress (func): If set, called periodically with a
+                :class:`.Progress` while reading.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            The new :class:`.Set`.
+
+        """
+        rset = cls(**kwargs)
+        rset.update_from_stream(source, fmt=fmt, progress=progress)
+        return rset
+
+    def update_from_stream(self, source, fmt=None, progress=None):
+        """Adds each sequence read from ``source`` to the set.
+
+        Sequences are streamed with :func:`.read_sequences` and inserted as
+        they are read, so the source is never held in memory.
+
+        Args:
+            source (str or file): A path, optionally gzip compressed, or an
+                open text file object.
+            fmt (str): One of ``plain``, ``fasta``, or ``fastq``.  If
+                ``None``, the format is detected from the first line.
+            progress (func): If set, called periodically with a
+                :class:`.Progress` while reading.
+
+        """
+        for element in read_sequences(source, fmt=fmt, progress=progress):
+            self.add(element)
+
     def add(self, element):
         """Adds an element to the set.
 
@@ -50,6 +95,85 @@ class Set:
         """
         self.dict[element] = True
 
+    def find(self, key):
+        """Finds an element of the set matching ``key``.
+
+        Searching stops at the first match found.
+
+        Args:
+            key (str): The key string to match
+
+        Returns:
+            An element matching ``key`` taking into account ambiguity, or
+            ``None`` if no element matches.
+
+        """
+        match = self.dict.get_first_match(key)
+        return match[0] if match else None
+
+    def estimate_matches(self, key):
+        """Estimates the number of elements matching ``key``.
+
+        See :meth:`.Trie.estimate_matches`.
+
+        Args:
+            key (str): The key string to match
+
+        Returns:
+            The estimated number of matches as a float.
+
+        """
+        return self.dict.estimate_matches(key)
+
+    async def acontains(self, key, **kwargs):
+        """Asynchronously checks if ``key`` is in the set taking into account
+        ambiguity.
+
+        See :meth:`.Trie.aget_matches` for how the search cooperates with the
+        event loop.  If the set is ``concurrent``, the check is instead run
+        with ``in`` in ``executor``, or the event loop's default executor if
+        none is given, so it can hold the lock.
+
+        Args:
+            key (str): The key string to match
+            **kwargs: Passed to :meth:`.Trie.aget_matches`
+
+        Returns:
+            If an element matches ``key``.
+
+        """
+        if self.dict.lock is not None:
+            return await asyncio.get_event_loop().run_in_executor(
+                kwargs.get('executor'), self.__contains__, key
+            )
+
+        matches = self.dict.trie.aget_matches(key, limit=1, **kwargs)
+        try:
+            async for _ in matches:
+                return True
+            return False
+        finally:
+            await matches.aclose()
+
+    def cache_info(self):
+        """
+        Returns:
+            The :class:`.CacheInfo` of the underlying trie's match cache, or
+            ``None`` if caching is disabled.
+
+        """
+        return self.dict.cache_info()
+
+    def __contains__(self, key):
+        """Returns if `key` is in the set taking into account ambiguity.
+
+        Objects other than non-empty strings are never in the set.
+
+        """
+        if not isinstance(key, str) or not key:
+            return False
+        return self.find(key) is not None
+
     def __iter__(self):
         """Yields the elements in the set"""
         yield from self.dict.keys()
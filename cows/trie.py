@@ -1,4 +1,13 @@
-_EMPTY = object()
+import asyncio
+import heapq
+import itertools
+import random
+
+from .bulk import DEFAULT_CHUNK_SIZE, common_prefix_length, external_sort
+from .cache import MatchCache
+from .index import PositionIndex
+from .util import _EMPTY, compatible
+from .views import ItemsView, KeysView, ValuesView
 
 
 class Trie:
@@ -36,6 +45,15 @@ class Trie:
             trie node.
         wildcard (char): The character representing ambiguity.
         initialize (tuple): Pairs of values with which to initialize the trie.
+        cache_size (int): If set, caches the results of up to this many
+            :meth:`.get_matches` queries in a :class:`.MatchCache`.  Inserting
+            a new key evicts only the cached queries it matches.
+        cache_policy (str): The eviction policy of the cache, either ``lru``
+            or ``fifo``.
+        index_threshold (float): If set, maintains a :class:`.PositionIndex`
+            of the strings in the trie.  :meth:`.get_matches` queries where at
+            least this fraction of characters are wildcards are answered from
+            the index rather than by traversing the trie.
 
     Note:
         Consider using the other cows data structures, which are more
@@ -43,16 +61,84 @@ class Trie:
 
 
     """
+    # Only the root of a trie caches or indexes matches, so child nodes share
+    # these defaults rather than storing their own
+    cache = None
+    index = None
+    index_threshold = None
+
     def __init__(self, key=None, value=_EMPTY, wildcard='*',
-                 initialize=None):
+                 initialize=None, cache_size=None, cache_policy='lru',
+                 index_threshold=None):
         self.children = {}
         self.key = key
         self.value = value
         self.wildcard = wildcard
+        # The number of nodes with values in this subtree, including this one
+        self.size = 0 if value is _EMPTY else 1
+        if cache_size:
+            self.cache = MatchCache(cache_size, wildcard, cache_policy)
+        if index_threshold is not None:
+            self.index_threshold = index_threshold
+            self.index = PositionIndex(wildcard)
 
         if initialize:
-            for init_key, init_val in initialize:
-                self[init_key] = init_val
+            self._load(initialize)
+
+    def bulk_load(self, items, presorted=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Sets many key/value pairs in the trie in a single pass.
+
+        Items are inserted in sorted order, reusing the path to the previous
+        key so each insertion only walks the suffix it does not share with
+        the previous key.  As with ``__setitem__``, ambiguity is not taken
+        into account and the last value for a repeated key is kept.
+
+        Args:
+            items (iterable): ``(key, value)`` pairs to set.
+            presorted (bool): If ``items`` are already sorted by key.  If
+                not, they are sorted with :func:`.external_sort`.
+            chunk_size (int): The maximum number of items held in memory
+                while sorting.
+
+        Raises:
+            IndexError
+                If a key is empty, as with ``__setitem__``.
+
+        """
+        if not presorted:
+            items = external_sort(
+                items, key=lambda item: item[0], chunk_size=chunk_size
+            )
+        self._load(items)
+
+    def _load(self, items):
+        """Sets ``(key, value)`` pairs reusing the path of the previous key"""
+        if self.cache is not None:
+            self.cache.clear()
+
+        path = [self]
+        prev = ''
+        for key, value in items:
+            if not key:
+                # As with __setitem__, the root cannot hold a value
+                raise IndexError('Keys must not be empty')
+            common = common_prefix_length(prev, key)
+            del path[common + 1:]
+            node = path[-1]
+            for prefix in key[common:]:
+                child = node.children.get(prefix)
+                if child is None:
+                    child = Trie(prefix, wildcard=self.wildcard)
+                    node.children[prefix] = child
+                node = child
+                path.append(node)
+            if node.value is _EMPTY:
+                for ancestor in path:
+                    ancestor.size += 1
+                if self.index is not None:
+                    self.index.add(key, node)
+            node.value = value
+            prev = key
 
     def __getitem__(self, key):
         """Gets an item from the trie.
@@ -89,12 +175,24 @@ class Trie:
 
         """
         node = self
+        path = [self]
+        full_key = key
         while True:
             prefix, rest = key[0], key[1:]
-            node = node.children.setdefault(
-                prefix, Trie(prefix, wildcard=self.wildcard)
-            )
+            child = node.children.get(prefix)
+            if child is None:
+                child = Trie(prefix, wildcard=self.wildcard)
+                node.children[prefix] = child
+            node = child
+            path.append(node)
             if not rest:
+                if node.value is _EMPTY:
+                    for ancestor in path:
+                        ancestor.size += 1
+                    if self.cache is not None:
+                        self.cache.invalidate(full_key)
+                    if self.index is not None:
+                        self.index.add(full_key, node)
                 node.value = value
                 break
             key = rest
@@ -103,41 +201,68 @@ class Trie:
         """Returns the representation of the trie"""
         return 'cows.Trie({}, {})'.format(self.key, self.value)
 
+    def cache_info(self):
+        """
+        Returns:
+            The :class:`.CacheInfo` of the match cache, or ``None`` if caching
+            is disabled.
+
+        """
+        return self.cache.info() if self.cache is not None else None
+
     def __len__(self):
         """Returns the number of nodes in the trie"""
-        return len(list(self.items()))
+        return self.size
 
     def __iter__(self):
         yield from self.keys()
 
-    def keys(self):
-        """Yields the keys in the trie"""
-        yield from (item[0] for item in self.items())
+    def keys(self, prefix='', sort=False):
+        """Gets the keys in the trie.
 
-    def values(self, extract_values=False):
-        """Yields the values in the trie"""
-        yield from (
-            item[1] for item in self.items(extract_values=extract_values)
-        )
+        Args:
+            prefix (str): If set, only keys starting with ``prefix`` are
+                included and only that subtree is walked.
+            sort (bool): If true, keys are iterated in lexicographic order.
 
-    def items(self, extract_values=False):
-        """Gets all items in the trie.
+        Returns:
+            A :class:`.KeysView` of the keys.
 
-        Yields:
-            ``(node_key, node)`` pairs of all items.
         """
-        to_visit = [(self.key or '', self)]
+        return KeysView(self, prefix, sort)
 
-        while True:
-            try:
-                node_key, node = to_visit.pop()
-            except IndexError:
-                break
+    def values(self, extract_values=False, prefix='', sort=False):
+        """Gets the values in the trie.
+
+        Args:
+            extract_values (bool): If true, the values stored in the trie are
+                included rather than the nodes holding them.
+            prefix (str): If set, only values with keys starting with
+                ``prefix`` are included and only that subtree is walked.
+            sort (bool): If true, values are iterated in lexicographic order
+                of their keys.
+
+        Returns:
+            A :class:`.ValuesView` of the values.
+
+        """
+        return ValuesView(self, prefix, sort, extract_values)
+
+    def items(self, extract_values=False, prefix='', sort=False):
+        """Gets all items in the trie.
 
-            if node.value != _EMPTY:
-                yield (node_key, node.value if extract_values else node)
-            for child in node.children.values():
-                to_visit.append((node_key + child.key, child))
+        Args:
+            extract_values (bool): If true, the values stored in the trie are
+                included rather than the nodes holding them.
+            prefix (str): If set, only items with keys starting with
+                ``prefix`` are included and only that subtree is walked.
+            sort (bool): If true, items are iterated in lexicographic order
+                of their keys.
+
+        Returns:
+            An :class:`.ItemsView` of ``(node_key, node)`` pairs of all items.
+        """
+        return ItemsView(self, prefix, sort, extract_values)
 
     def children_matching(self, prefix):
         """Gets all child nodes matching the single character prefix.  If the
@@ -178,7 +303,7 @@ class Trie:
             if self.wildcard in self.children:
                 yield self.children[self.wildcard]
 
-    def get_matches(self, key):
+    def get_matches(self, key, limit=None):
         """Searches the trie for strings matching ``key``.
 
         Example:
@@ -187,6 +312,12 @@ class Trie:
 
         Args:
             key (str): The string for which to search for matches in the trie
+            limit (int): If set, stops searching after this many matches have
+                been found.  The trie is searched depth-first so the first
+                match is reached after visiting as few nodes as possible.
+                If the trie has a cache, a query which is not yet cached is
+                instead searched in full so that repeated limited queries,
+                such as membership checks, are answered from the cache.
 
         Yields:
             ``(key, value)`` tuples for nodes that match ``key``.
@@ -196,25 +327,278 @@ class Trie:
             to be consistent.
 
         """
-        next_visit = ('', key, self)
-        to_visit = []
+        if self.cache is None:
+            yield from itertools.islice(self._search(key), limit)
+            return
+
+        matches = self.cache.get(key)
+        if matches is None:
+            # Only complete results can be cached, even if limited
+            matches = list(self._search(key))
+            self.cache.put(key, matches)
+        yield from itertools.islice(matches, limit)
+
+    def get_matches_many(self, keys):
+        """Searches the trie for strings matching each of ``keys`` at once.
+
+        Rather than searching once per key, all keys are matched in a single
+        traversal which visits each trie node at most once, carrying along the
+        keys which could still match at that node.  Repeated keys are only
+        searched for once.
+
+        Args:
+            keys (iterable): The strings for which to search for matches in
+                the trie
+
+        Returns:
+            A dictionary mapping each of ``keys`` to a list of ``(key,
+            value)`` tuples for the nodes that match it.
+
+        """
+        results = {key: [] for key in keys}
+        queries = [key for key in results if key]
+        to_visit = [('', 0, self, range(len(queries)))]
+
+        while to_visit:
+            prev, depth, node, active = to_visit.pop()
+            groups = {}
+            for i in active:
+                for child in node.children_matching(queries[i][depth]):
+                    groups.setdefault(child.key, []).append(i)
+
+            for prefix, group in groups.items():
+                child = node.children[prefix]
+                remaining = []
+                for i in group:
+                    if len(queries[i]) > depth + 1:
+                        remaining.append(i)
+                    elif child.value is not _EMPTY:
+                        results[queries[i]].append((prev + prefix, child))
+                if remaining:
+                    to_visit.append((prev + prefix, depth + 1, child,
+                                     remaining))
+        return results
+
+    async def aget_matches(self, key, limit=None, chunk_size=1000,
+                           executor=None, offload_threshold=None):
+        """Asynchronously searches the trie for strings matching ``key``.
+
+        This is a cooperative version of :meth:`.get_matches` for use from an
+        ``asyncio`` event loop.  The traversal returns control to the loop
+        after every ``chunk_size`` visited nodes so a highly ambiguous query
+        does not block other tasks.  Alternatively, large searches can be
+        offloaded to a thread in ``executor``.
+
+        Example:
+            .. code-block:: python
+
+                async for match, node in trie.aget_matches('A**T'):
+                    print(match, node.value)
+
+        Note:
+            Writes made by other tasks while a search is suspended may or may
+            not be reflected in its results.  Results of these searches are
+            read from, but not added to, the match cache.
+
+        Args:
+            key (str): The string for which to search for matches in the trie
+            limit (int): If set, stops searching after this many matches have
+                been found.
+            chunk_size (int): The number of nodes to visit between returning
+                control to the event loop.
+            executor (concurrent.futures.Executor): If set, searches are run
+                in this executor instead of cooperatively.
+            offload_threshold (float): If set along with ``executor``, only
+                searches for which :meth:`.estimate_matches` predicts at least
+                this many matches are offloaded.
+
+        Yields:
+            ``(key, value)`` tuples for nodes that match ``key``.
+
+        """
+        if limit == 0:
+            return
+
+        if executor is not None and (offload_threshold is None or (
+                self.estimate_matches(key) >= offload_threshold)):
+            matches = await asyncio.get_event_loop().run_in_executor(
+                executor, lambda: list(self.get_matches(key, limit=limit))
+            )
+            for match in matches:
+                yield match
+            return
+
+        matches = self.cache.get(key) if self.cache is not None else None
+        if matches is None:
+            if self.index is not None and self._use_index(key):
+                matches = self.index.get_matches(key)
+            else:
+                matches = self._traverse(key, steps=True)
+
+        found = 0
+        visited = 0
+        for match in matches:
+            if match is None:
+                visited += 1
+                if visited % chunk_size == 0:
+                    await asyncio.sleep(0)
+                continue
+            found += 1
+            yield match
+            if found == limit:
+                return
+
+    def get_first_match(self, key):
+        """Searches the trie for the first string matching ``key``.
+
+        Args:
+            key (str): The string for which to search for a match in the trie
+
+        Returns:
+            A ``(key, value)`` tuple for the first node found matching
+            ``key``, or ``None`` if there are no matches.
+
+        """
+        return next(self.get_matches(key, limit=1), None)
+
+    def get_best_matches(self, key, limit=None):
+        """Searches the trie for strings matching ``key``, most specific first.
+
+        Unlike :meth:`.get_matches`, the trie is searched best-first, always
+        expanding the partial match which has consumed the fewest wildcards so
+        far.  Matches are therefore yielded in ascending order of the number
+        of wildcards they contain, with ties broken lexicographically, and
+        only as much of the trie as is needed to produce them is visited.
+
+        Example:
+            If the trie contains ``ACGT``, ``A**T``, and ``A*GT``, the key
+            ``ACGT`` will return ``ACGT``, ``A*GT``, and ``A**T`` in that
+            order.
+
+        Args:
+            key (str): The string for which to search for matches in the trie
+            limit (int): If set, stops searching after this many matches have
+                been found.
+
+        Yields:
+            ``(key, value)`` tuples for nodes that match ``key``.
+
+        """
+        yield from itertools.islice(self._traverse_best_first(key), limit)
+
+    def _traverse_best_first(self, key):
+        """Walks the trie in order of wildcards consumed yielding matches"""
+        # Paths are unique per node so heap entries never compare nodes
+        to_visit = [(0, '', key, self)]
+
+        while to_visit:
+            wildcards, prev, key, node = heapq.heappop(to_visit)
+            if not key:
+                yield (prev, node)
+                continue
 
-        while True:
-            prev, key, node = next_visit
+            prefix, rest = key[0], key[1:]
+            for child in node.children_matching(prefix):
+                if rest or child.value is not _EMPTY:
+                    heapq.heappush(to_visit, (
+                        wildcards + (child.key == self.wildcard),
+                        prev + child.key, rest, child
+                    ))
+
+    def estimate_matches(self, key, samples=64, seed=0):
+        """Estimates the number of strings in the trie matching ``key``.
+
+        The trie is searched level by level as with :meth:`.get_matches`, but
+        whenever more than ``samples`` partial matches are live, ``samples``
+        of them are drawn with probability proportional to the number of
+        strings in their subtree and reweighted so the estimate remains
+        unbiased.  The work done is therefore proportional to the length of
+        ``key`` rather than the number of matches.  When the number of live
+        partial matches never exceeds ``samples`` the result is exact.
+
+        Args:
+            key (str): The string for which to estimate the number of matches
+            samples (int): The maximum number of partial matches to follow at
+                each level.
+            seed (int): Seeds the sampling so estimates are reproducible.
+
+        Returns:
+            The estimated number of matches as a float.
+
+        """
+        rand = random.Random(seed)
+        frontier = [(self, 1.0)]
+        for depth, prefix in enumerate(key):
+            frontier = [
+                (child, weight) for node, weight in frontier
+                for child in node.children_matching(prefix)
+            ]
+            if depth == len(key) - 1:
+                return sum(
+                    weight for node, weight in frontier
+                    if node.value is not _EMPTY
+                )
+
+            if len(frontier) > samples:
+                masses = [weight * node.size for node, weight in frontier]
+                total = sum(masses)
+                frontier = [
+                    (node, total / (samples * node.size))
+                    for node, _ in rand.choices(
+                        frontier, weights=masses, k=samples)
+                ]
+        return 0.0
+
+    def scan_matches(self, key):
+        """Finds strings matching ``key`` by checking every string in the trie.
+
+        This visits every node regardless of ``key`` but avoids the
+        per-node overhead of :meth:`.get_matches`, so it can be faster when
+        ``key`` matches a large fraction of the trie.
+
+        Args:
+            key (str): The string for which to search for matches in the trie
+
+        Yields:
+            ``(key, value)`` tuples for nodes that match ``key``.
+
+        """
+        for node_key, node in self.items():
+            if compatible(node_key, key, self.wildcard):
+                yield (node_key, node)
+
+    def _search(self, key):
+        """Gets uncached matches for ``key`` from the index or by traversal"""
+        if self.index is not None and self._use_index(key):
+            return self.index.get_matches(key)
+        return self._traverse(key)
+
+    def _use_index(self, key):
+        """Returns if ``key`` has enough wildcards to search the index"""
+        return bool(key) and (
+            key.count(self.wildcard) >= self.index_threshold * len(key))
+
+    def _traverse(self, key, steps=False):
+        """Walks the trie yielding matches for ``key`` without caching.
+
+        If ``steps`` is true, ``None`` is also yielded after visiting each
+        node so callers such as :meth:`.aget_matches` can pause the walk.
+
+        """
+        to_visit = [('', key, self)]
+
+        while to_visit:
+            prev, key, node = to_visit.pop()
             prefix, rest = key[0], key[1:]
             matching_children = node.children_matching(prefix)
 
             if not rest:
-                yield from [
-                    (prev + c.key, c) for c in matching_children
-                    if c.value != _EMPTY
-                ]
+                for child in matching_children:
+                    if child.value is not _EMPTY:
+                        yield (prev + child.key, child)
             else:
                 to_visit.extend(
                     (prev + c.key, rest, c) for c in matching_children
                 )
-
-            try:
-                next_visit = to_visit.pop()
-            except IndexError:
-                break
+            if steps:
+                yield None
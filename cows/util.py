@@ -0,0 +1,25 @@
+# Marks trie nodes which do not hold a value
+_EMPTY = object()
+
+
+def compatible(first, second, wildcard):
+    """Checks if two strings match taking into account ambiguity.
+
+    Two strings match if they are the same length and, at every position,
+    their characters are equal or at least one of them is ``wildcard``.
+
+    Args:
+        first (str): The first string.
+        second (str): The second string.
+        wildcard (char): The character representing ambiguity.
+
+    Returns:
+        ``True`` if the strings match, else ``False``.
+
+    """
+    if len(first) != len(second):
+        return False
+    return all(
+        a == b or a == wildcard or b == wildcard
+        for a, b in zip(first, second)
+    )
@@ -0,0 +1,180 @@
+import collections.abc
+
+from .util import _EMPTY
+
+
+class TrieView:
+    """A lazy view of the strings stored in all or part of a trie.
+
+    Views are returned by :meth:`.Trie.keys`, :meth:`.Trie.values`, and
+    :meth:`.Trie.items` and the equivalent :class:`.Dict` methods.  Like the
+    views of the builtin ``dict``, they reflect later changes to the trie.
+    Only the subtree of strings starting with ``prefix`` is walked when
+    iterating, and ``len()`` is answered from the counts maintained on each
+    trie node without walking at all.
+
+    Each view is also an instance of the corresponding :mod:`collections.abc`
+    view, so keys and items views support set operations and comparisons
+    with other sets.
+
+    Args:
+        trie (Trie): The trie to view.
+        prefix (str): If set, only strings starting with this prefix are
+            included.
+        sort (bool): If true, strings are iterated in lexicographic order.
+        extract_values (bool): If true, values are the values stored in the
+            trie rather than the trie nodes holding them.
+
+    """
+    def __init__(self, trie, prefix='', sort=False, extract_values=False):
+        self.trie = trie
+        self.prefix = prefix
+        self.sort = sort
+        self.extract_values = extract_values
+
+    def _root(self):
+        """Gets the node for ``prefix`` or ``None`` if it does not exist"""
+        try:
+            return self.trie[self.prefix]
+        except KeyError:
+            return None
+
+    def _walk(self):
+        """Yields ``(key, node)`` pairs for nodes with values in the view"""
+        root = self._root()
+        if root is None:
+            return
+
+        to_visit = [((self.trie.key or '') + self.prefix, root)]
+        while to_visit:
+            node_key, node = to_visit.pop()
+            if node.value is not _EMPTY:
+                yield (node_key, node)
+
+            children = node.children.values() if not self.sort else [
+                child for _, child in sorted(
+                    node.children.items(), reverse=True)
+            ]
+            for child in children:
+                to_visit.append((node_key + child.key, child))
+
+    def _lookup(self, key):
+        """Gets the node with a value for ``key`` in the view, if any"""
+        # Keys of a view on a node below the root start with the node's key
+        base = self.trie.key or ''
+        if not (isinstance(key, str) and key.startswith(base + self.prefix)):
+            return None
+        try:
+            node = self.trie[key[len(base):]]
+        except KeyError:
+            return None
+        return node if node.value is not _EMPTY else None
+
+    def _value(self, node):
+        """Gets the value to report for ``node``"""
+        return node.value if self.extract_values else node
+
+    def __len__(self):
+        """Returns the number of strings in the view"""
+        root = self._root()
+        return root.size if root is not None else 0
+
+    def __repr__(self):
+        """Returns the representation of the view"""
+        return 'cows.{}({})'.format(type(self).__name__, list(self))
+
+
+class KeysView(TrieView, collections.abc.KeysView):
+    """A view of the keys in a trie.  See :class:`.TrieView`."""
+    def __iter__(self):
+        """Yields the keys in the view"""
+        yield from (key for key, _ in self._walk())
+
+    def __contains__(self, key):
+        """Returns if ``key`` is exactly a key in the view"""
+        return self._lookup(key) is not None
+
+
+class ValuesView(TrieView, collections.abc.ValuesView):
+    """A view of the values in a trie.  See :class:`.TrieView`."""
+    def __iter__(self):
+        """Yields the values in the view"""
+        yield from (self._value(node) for _, node in self._walk())
+
+    def __contains__(self, value):
+        """Returns if ``value`` is a value in the view"""
+        return any(v is value or v == value for v in self)
+
+
+class ItemsView(TrieView, collections.abc.ItemsView):
+    """A view of the ``(key, value)`` items in a trie.  See
+    :class:`.TrieView`."""
+    def __iter__(self):
+        """Yields the items in the view"""
+        yield from ((key, self._value(node)) for key, node in self._walk())
+
+    def __contains__(self, item):
+        """Returns if ``item`` is exactly a ``(key, value)`` item in the
+        view"""
+        try:
+            key, value = item
+        except (TypeError, ValueError):
+            return False
+        node = self._lookup(key)
+        return node is not None and self._value(node) == value
+
+
+class SubView:
+    """A read-only view of the part of a :class:`.Dict` whose keys start with
+    a prefix.
+
+    Args:
+        trie (Trie): The trie of the dictionary.
+        prefix (str): Only keys starting with this prefix are included.
+        sort (bool): If true, keys are iterated in lexicographic order.
+
+    """
+    def __init__(self, trie, prefix, sort=False):
+        self.trie = trie
+        self.prefix = prefix
+        self.sort = sort
+
+    def keys(self):
+        """
+        Returns:
+            A :class:`.KeysView` of the keys in the view.
+
+        """
+        return KeysView(self.trie, self.prefix, self.sort)
+
+    def values(self):
+        """
+        Returns:
+            A :class:`.ValuesView` of the values in the view.
+
+        """
+        return ValuesView(self.trie, self.prefix, self.sort, True)
+
+    def items(self):
+        """
+        Returns:
+            An :class:`.ItemsView` of the ``(key, value)`` items in the view.
+
+        """
+        return ItemsView(self.trie, self.prefix, self.sort, True)
+
+    def __iter__(self):
+        """Yields the keys in the view"""
+        yield from self.keys()
+
+    def __contains__(self, key):
+        """Returns if ``key`` is exactly a key in the view"""
+        return key in self.keys()
+
+    def __len__(self):
+        """Returns the number of keys in the view"""
+        return len(self.keys())
+
+    def __repr__(self):
+        """Returns the representation of the view"""
+        return 'cows.SubView({})'.format(self.prefix)
@@ -0,0 +1,200 @@
+import os
+import pickle
+import re
+import struct
+import zlib
+
+
+_HEADER = struct.Struct('<II')
+
+_FILE_PATTERN = re.compile(r'^(checkpoint|log)-(\d+)\.bin$')
+
+
+def _write_record(handle, key, value):
+    """Writes a length and checksum framed ``(key, value)`` record"""
+    payload = pickle.dumps((key, value), pickle.HIGHEST_PROTOCOL)
+    handle.write(_HEADER.pack(len(payload), zlib.crc32(payload)))
+    handle.write(payload)
+
+
+def _read_records(path):
+    """Yields the ``(key, value)`` records in a file.
+
+    Reading stops at the first truncated or corrupt record, which is the
+    result of a crash part way through a write.
+
+    Returns:
+        The offset of the end of the last valid record.
+
+    """
+    with open(path, 'rb') as handle:
+        while True:
+            offset = handle.tell()
+            header = handle.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return offset
+            length, checksum = _HEADER.unpack(header)
+            payload = handle.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return offset
+            yield pickle.loads(payload)
+
+
+class WriteAheadLog:
+    """An append-only log of writes with periodic checkpoints.
+
+    Each write is appended as a compact binary record to the current log
+    file.  Records are buffered and the log is only ``fsync``-ed every
+    ``sync_every`` writes, so up to that many of the most recent writes may
+    be lost on a crash.  Every ``checkpoint_every`` writes the owner of the
+    log is expected to write a checkpoint of its full contents with
+    :meth:`.checkpoint`, after which the log is restarted and older files
+    are removed.
+
+    Recovery with :meth:`.recover` loads the latest checkpoint and replays
+    the log written after it.
+
+    Args:
+        directory (str): The directory in which to store the log and
+            checkpoints.  It is created if it does not exist.
+        sync_every (int): The number of writes between calls to ``fsync``.
+        checkpoint_every (int): The number of writes after which
+            :meth:`.checkpoint_due` returns ``True``.  If ``None``,
+            checkpoints are only written when requested.
+
+    Example:
+        .. code-block:: python
+
+            import cows
+
+            def increment(match, old_value, new_value):
+                return old_value + new_value
+
+            wal = cows.wal.WriteAheadLog('counts', checkpoint_every=100000)
+            counts = cows.Dict(updater=increment, wal=wal)
+            counts['ATCG'] = 1
+            wal.close()
+
+            # Later, possibly after a crash
+            wal = cows.wal.WriteAheadLog('counts', checkpoint_every=100000)
+            counts = cows.Dict(updater=increment, wal=wal)
+
+    """
+    def __init__(self, directory, sync_every=1000, checkpoint_every=None):
+        self.directory = directory
+        self.sync_every = sync_every
+        self.checkpoint_every = checkpoint_every
+        self.generation = 0
+        self._unsynced = 0
+        self._since_checkpoint = 0
+        self._handle = None
+
+        os.makedirs(directory, exist_ok=True)
+        generations = self._generations('checkpoint')
+        if generations:
+            self.generation = max(generations)
+
+    def _path(self, kind, generation):
+        """Gets the path to a log or checkpoint file"""
+        return os.path.join(
+            self.directory, '{}-{}.bin'.format(kind, generation)
+        )
+
+    def _generations(self, kind):
+        """Gets the generations of the existing files of ``kind``"""
+        return [
+            int(match.group(2)) for match in (
+                _FILE_PATTERN.match(name)
+                for name in os.listdir(self.directory)
+            ) if match and match.group(1) == kind
+        ]
+
+    def recover(self):
+        """Reads the state recorded by the log.
+
+        Yields:
+            ``(key, value)`` pairs from the latest checkpoint followed by
+            those written to the log since.  Later pairs overwrite earlier
+            pairs with the same key.
+
+        """
+        path = self._path('checkpoint', self.generation)
+        if os.path.exists(path):
+            yield from _read_records(path)
+
+        path = self._path('log', self.generation)
+        if os.path.exists(path):
+            valid = yield from _read_records(path)
+            if valid < os.path.getsize(path):
+                # Drop a partially written record so appends remain readable
+                os.truncate(path, valid)
+
+    def append(self, key, value):
+        """Records that ``key`` was set to ``value``.
+
+        Args:
+            key (str): The key which was set.
+            value (obj): The final, picklable, value of ``key``.
+
+        """
+        if self._handle is None:
+            self._handle = open(self._path('log', self.generation), 'ab')
+        _write_record(self._handle, key, value)
+
+        self._since_checkpoint += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Flushes buffered writes and ``fsync``-s the log"""
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+        self._unsynced = 0
+
+    def checkpoint_due(self):
+        """Returns if ``checkpoint_every`` writes have occurred since the last
+        checkpoint"""
+        return bool(self.checkpoint_every) and (
+            self._since_checkpoint >= self.checkpoint_every)
+
+    def checkpoint(self, items):
+        """Writes a checkpoint and restarts the log.
+
+        The checkpoint is written to a temporary file and atomically renamed
+        so a crash during checkpointing leaves the previous checkpoint and log
+        intact.
+
+        Args:
+            items (iterable): ``(key, value)`` pairs of the full current
+                state.
+
+        """
+        generation = self.generation + 1
+        path = self._path('checkpoint', generation)
+        with open(path + '.tmp', 'wb') as handle:
+            for key, value in items:
+                _write_record(handle, key, value)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(path + '.tmp', path)
+
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self.generation = generation
+        self._unsynced = 0
+        self._since_checkpoint = 0
+
+        for kind in ('checkpoint', 'log'):
+            for old in self._generations(kind):
+                if old < generation:
+                    os.remove(self._path(kind, old))
+
+    def close(self):
+        """Syncs and closes the log"""
+        self.sync()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
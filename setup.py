@@ -14,6 +14,7 @@ setup(
     packages=[
         'cows',
     ],
+    python_requires='>=3.6',
 
     description='''Simple, efficient collections for strings with
     wildcards.''',
@@ -0,0 +1,176 @@
+import asyncio
+import concurrent.futures
+import random
+import sys
+import threading
+
+import pytest
+
+import cows
+from cows.aio import MatchBatcher
+
+
+INPUTS = ('ATCG', 'A*TT', 'CTCG', 'GCTA', 'TT*A')
+
+
+def run(coro):
+    # run() is not available before Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def collect(agen):
+    async def _collect():
+        return [item async for item in agen]
+    return run(_collect())
+
+
+@pytest.mark.parametrize('pattern', ['*TCG', 'ATTT', 'ATC', '****', 'T*GA'])
+@pytest.mark.parametrize('options', [
+    {},
+    {'cache_size': 10},
+    {'index_threshold': 0.5},
+])
+def test_aget_matches(pattern, options):
+    trie = cows.Trie(initialize=[(k, k) for k in INPUTS], **options)
+    # Populates the cache, if any
+    expected = sorted(m[0] for m in trie.get_matches(pattern))
+
+    for chunk_size in (1, 1000):
+        matches = collect(trie.aget_matches(pattern, chunk_size=chunk_size))
+        assert sorted(m[0] for m in matches) == expected
+
+    for limit in (0, 1, 2):
+        matches = collect(trie.aget_matches(pattern, limit=limit))
+        assert len(matches) == min(limit, len(expected))
+
+
+def test_aget_matches_yields():
+    trie = cows.Trie(initialize=[(k, k) for k in INPUTS])
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def search():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        matches = [m async for m in trie.aget_matches('****', chunk_size=1)]
+        task.cancel()
+        return matches
+
+    assert len(run(search())) == 5
+    assert len(ticks) > 5
+
+
+@pytest.mark.parametrize('offload_threshold', [None, 0, 100])
+def test_aget_matches_executor(offload_threshold):
+    trie = cows.Trie(initialize=[(k, k) for k in INPUTS])
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        matches = collect(trie.aget_matches(
+            '****', executor=executor, offload_threshold=offload_threshold
+        ))
+    assert sorted(m[0] for m in matches) == sorted(INPUTS)
+
+
+def test_get_matches_many():
+    trie = cows.Trie(initialize=[(k, k) for k in INPUTS])
+    patterns = ['*TCG', 'ATTT', 'ATC', '****', 'T*GA', '*TCG', 'T', '']
+
+    results = trie.get_matches_many(patterns)
+
+    assert sorted(results) == sorted(set(patterns))
+    for pattern in patterns:
+        expected = sorted(m[0] for m in trie.get_matches(pattern)) if (
+            pattern) else []
+        assert sorted(m[0] for m in results[pattern]) == expected
+
+
+@pytest.mark.parametrize('max_batch', [None, 2])
+@pytest.mark.parametrize('threaded', [False, True])
+def test_batcher(max_batch, threaded):
+    trie = cows.Trie(initialize=[(k, k) for k in INPUTS])
+    patterns = ['*TCG', 'ATTT', 'ATC', '****', '*TCG']
+
+    async def search(executor):
+        batcher = MatchBatcher(trie, max_batch=max_batch, executor=executor)
+        return await asyncio.gather(*[
+            batcher.get_matches(pattern) for pattern in patterns
+        ])
+
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        results = run(search(executor if threaded else None))
+
+    for pattern, matches in zip(patterns, results):
+        assert sorted(m[0] for m in matches) == sorted(
+            m[0] for m in trie.get_matches(pattern))
+
+
+def test_dict_set():
+    rdict = cows.Dict(initialize=[('ATCG', 1), ('GCTA', 2)])
+    assert sorted(collect(rdict.amatches('****'))) == [1, 2]
+    assert collect(rdict.amatches('****', limit=1, chunk_size=1)) in ([1], [2])
+
+    rset = cows.Set(['ABCD', '*EFG'])
+    assert run(rset.acontains('HEFG'))
+    assert not run(rset.acontains('XYZW'))
+
+
+def test_concurrent_writes():
+    rset = cows.Set(['AAA'], concurrent=True)
+    batcher = MatchBatcher(rset.dict.trie, lock=rset.dict.lock)
+
+    def write(seed):
+        # Many distinct characters keep resizing the nodes being searched
+        rand = random.Random(seed)
+        for _ in range(2000):
+            rset.add(''.join(chr(rand.randrange(65, 20000)) for _ in range(3)))
+
+    async def search(threads):
+        while any(thread.is_alive() for thread in threads):
+            assert len([m async for m in rset.dict.amatches(
+                '***', chunk_size=1)]) >= 1
+            assert await rset.acontains('AA*', chunk_size=1)
+            assert len(await batcher.get_matches('***')) >= 1
+
+    # Searches must hold the lock while other threads write.  Switching
+    # threads often makes unlocked searches more likely to fail.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads = [
+        threading.Thread(target=write, args=(seed,), daemon=True)
+        for seed in range(3)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        run(search(threads))
+    finally:
+        for thread in threads:
+            thread.join()
+        sys.setswitchinterval(interval)
+
+
+def test_concurrent_locked():
+    rset = cows.Set(['ABC', 'A*G'], concurrent=True)
+    trie = rset.dict.trie
+    batcher = MatchBatcher(trie, lock=rset.dict.lock)
+
+    def locked(search):
+        def _locked(*args, **kwargs):
+            assert rset.dict.lock._readers == 1
+            return search(*args, **kwargs)
+        return _locked
+
+    # Every search of a concurrent set must hold its lock
+    trie._traverse = locked(trie._traverse)
+    trie.get_matches_many = locked(trie.get_matches_many)
+
+    assert sorted(collect(rset.dict.amatches('A**'))) == [True, True]
+    assert run(rset.acontains('AB*'))
+    assert len(run(batcher.get_matches('A**'))) == 2
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from cows.bulk import common_prefix_length, external_sort
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 100, 1000])
+def test_external_sort(chunk_size):
+    rand = random.Random(0)
+    items = [(rand.randint(0, 20), i) for i in range(100)]
+
+    result = list(external_sort(items, key=lambda item: item[0],
+                                chunk_size=chunk_size))
+
+    # Python's sort is stable so this also checks stability
+    assert result == sorted(items, key=lambda item: item[0])
+
+
+def test_external_sort_empty():
+    assert list(external_sort([], chunk_size=1)) == []
+
+
+@pytest.mark.parametrize(
+    'first,second,expected',
+    [
+        ('', '', 0),
+        ('ABC', '', 0),
+        ('ABC', 'ABD', 2),
+        ('ABC', 'ABCDE', 3),
+        ('ABCDE', 'ABCDE', 5),
+        ('XBC', 'ABC', 0),
+    ]
+)
+def test_common_prefix_length(first, second, expected):
+    assert common_prefix_length(first, second) == expected
+    assert common_prefix_length(second, first) == expected
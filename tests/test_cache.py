@@ -0,0 +1,82 @@
+import random
+import time
+
+import pytest
+
+from cows.cache import MatchCache
+
+
+def test_get_put():
+    cache = MatchCache(2)
+    assert cache.get('ABC') is None
+
+    cache.put('ABC', ['ABC'])
+    assert cache.get('ABC') == ['ABC']
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (
+        1, 1, 2, 1)
+
+
+@pytest.mark.parametrize(
+    'policy,evicted,kept',
+    [
+        ('lru', 'DEF', 'ABC'),
+        ('fifo', 'ABC', 'DEF'),
+    ]
+)
+def test_eviction(policy, evicted, kept):
+    cache = MatchCache(2, policy=policy)
+    cache.put('ABC', [])
+    cache.put('DEF', [])
+    cache.get('ABC')
+    cache.put('GHI', [])
+
+    assert len(cache) == 2
+    assert cache.get(evicted) is None
+    assert cache.get(kept) == []
+
+
+@pytest.mark.parametrize(
+    'queries,key,remaining',
+    [
+        (('ABC', 'AB*', '*BD', 'ABCD', 'DEF'), 'ABC', ('*BD', 'ABCD', 'DEF')),
+        (('ABC', 'AB*', '*BD', 'ABCD', 'DEF'), '*B*', ('ABCD', 'DEF')),
+    ]
+)
+def test_invalidate(queries, key, remaining):
+    cache = MatchCache(10)
+    for query in queries:
+        cache.put(query, [])
+
+    cache.invalidate(key)
+
+    assert sorted(q for q in queries if cache.get(q) is not None) == sorted(
+        remaining)
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        MatchCache(10, policy='random')
+
+
+def test_invalidate_scaling():
+    def invalidate_time(size):
+        rand = random.Random(0)
+        cache = MatchCache(size)
+        while len(cache) < size:
+            cache.put(''.join(rand.choice('ACGT') for _ in range(16)), [])
+        keys = [
+            ''.join(rand.choice('ACGT') for _ in range(16))
+            for _ in range(500)
+        ]
+        start = time.perf_counter()
+        for key in keys:
+            cache.invalidate(key)
+        return time.perf_counter() - start
+
+    # Invalidating only searches the cached queries compatible with the key
+    # rather than checking every cached query of the same length
+    small = min(invalidate_time(10) for _ in range(3))
+    large = min(invalidate_time(5000) for _ in range(3))
+    assert large < 10 * small + 0.05
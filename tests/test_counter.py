@@ -0,0 +1,71 @@
+import pytest
+
+import cows
+
+
+@pytest.mark.parametrize(
+    'keys,expected',
+    [
+        (
+            ('ATCG', 'GCTA', 'TT*A', 'T*GA', '****', 'ATCG'),
+            {'ATCG': 3, 'GCTA': 1, 'TT*A': 2}
+        )
+    ]
+)
+def test_initialize(keys, expected):
+    counter = cows.Counter(keys)
+
+    assert len(counter) == len(expected)
+    assert dict(counter.items()) == expected
+    assert sorted(counter) == sorted(expected)
+    assert sorted(counter.keys()) == sorted(expected.keys())
+    assert sorted(counter.values()) == sorted(expected.values())
+
+    for k, v in expected.items():
+        assert list(counter[k]) == [v]
+
+
+@pytest.mark.parametrize(
+    'keys,wildcard',
+    [
+        (('ATNG', 'ATCN', 'ANNT', 'GTTC', 'GTTC', 'GTNC', 'ANNN'), 'N'),
+        (('ABC', '*EF', 'GHF', 'G*F', 'AB*', '***', 'XYZ'), '*'),
+    ]
+)
+def test_matches_dict(keys, wildcard):
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    counter = cows.Counter(keys, wildcard=wildcard)
+    rdict = cows.Dict(updater=incr, wildcard=wildcard,
+                      initialize=[(k, 1) for k in keys])
+
+    assert dict(counter.items()) == dict(rdict.items())
+
+
+def test_update_mapping():
+    counter = cows.Counter({'ABC': 2, 'DEF': 3})
+    counter.update({'AB*': 5})
+    counter.add('DE*', 10)
+
+    assert dict(counter.items()) == {'ABC': 7, 'DEF': 13}
+
+
+def test_most_common():
+    counter = cows.Counter(['A', 'B', 'B', 'C', 'C', 'C'])
+
+    assert counter.most_common(2) == [('C', 3), ('B', 2)]
+    assert counter.most_common() == [('C', 3), ('B', 2), ('A', 1)]
+    assert counter.most_common(0) == []
+
+
+def test_repr():
+    counter = cows.Counter()
+    assert counter.__repr__() == 'cows.Counter()'
+
+
+def test_trie_options():
+    with pytest.raises(TypeError):
+        cows.Counter(cache_size=10)
+    with pytest.raises(TypeError):
+        cows.Counter(index_threshold=0.5)
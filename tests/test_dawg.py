@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+import cows
+
+
+@pytest.mark.parametrize(
+    'inputs,pattern,expected',
+    [
+        (('ATCG', 'A*TT', 'CTCG'), '*TCG', ('ATCG', 'CTCG')),
+        (('ATCG', 'A*TT', 'CTCG'), 'ATTT', ('A*TT',)),
+        (('ATCG', 'A*TT', 'CTCG'), 'ATC', ()),
+        (('ATCG', 'A*TT', 'CTCG'), '*TC', ()),
+        (('ATCG', 'A*TT', 'CTCG'), '****', ('ATCG', 'A*TT', 'CTCG')),
+        (('ATCG', 'A*TT', 'A*CG'), '*TCG', ('ATCG', 'A*CG')),
+        (('ATCG', 'GCTA', 'TT*A'), 'T*GA', ('TT*A',)),
+        (('ATCG', 'GCTA', 'TT*A'), '', ()),
+    ]
+)
+def test_get_matches(inputs, pattern, expected):
+    dawg = cows.Dawg(inputs)
+    assert sorted(dawg.get_matches(pattern)) == sorted(expected)
+    assert (pattern in dawg) == bool(expected)
+
+
+def test_matches_trie():
+    rand = random.Random(0)
+    keys = [
+        ''.join(rand.choice('ACGT*') for _ in range(rand.randint(1, 6)))
+        for _ in range(500)
+    ]
+    trie = cows.Trie(initialize=[(k, k) for k in keys])
+    dawg = cows.Dawg(keys)
+
+    assert len(dawg) == len(trie)
+    assert list(dawg) == sorted(trie.keys())
+    for pattern in keys[:100] + ['******', 'A*****', 'AC']:
+        assert sorted(dawg.get_matches(pattern)) == sorted(
+            m[0] for m in trie.get_matches(pattern))
+        assert len(list(dawg.get_matches(pattern, limit=1))) == min(
+            1, len(list(trie.get_matches(pattern))))
+
+
+def test_from_set():
+    rset = cows.Set(['AACGT', 'CACGT', 'GACGT', 'TACGT', 'GACGN'],
+                    wildcard='N')
+    dawg = cows.Dawg.from_set(rset)
+
+    assert list(dawg) == sorted(rset)
+    assert 'NACGT' in dawg
+    assert 'AAAAA' not in dawg
+
+    report = dawg.memory_report()
+    assert report['nodes'] == 6
+    assert report['trie_nodes'] == 21
+    assert report['dawg_bytes'] < report['trie_bytes']
+    assert 0 < report['saved'] < 1
+
+
+def test_from_concurrent_set():
+    rset = cows.Set(['ACGT', 'AC*T', 'GGGG'], concurrent=True)
+    reads = []
+    keys = rset.dict.keys
+
+    def locked_keys(*args, **kwargs):
+        reads.append(args or kwargs)
+        return keys(*args, **kwargs)
+
+    # The set is read through its locked snapshot
+    rset.dict.keys = locked_keys
+    dawg = cows.Dawg.from_set(rset)
+
+    assert reads
+    assert list(dawg) == sorted(rset)
+
+
+def test_presorted():
+    dawg = cows.Dawg(['AB', 'AB', 'ABC', 'B'], presorted=True)
+    assert list(dawg) == ['AB', 'ABC', 'B']
+    assert len(dawg) == 3
+
+    with pytest.raises(ValueError):
+        cows.Dawg(['B', 'A'], presorted=True)
+
+
+def test_empty_string():
+    dawg = cows.Dawg(['', 'A', ''])
+    assert list(dawg) == ['A']
+    assert len(dawg) == 1
+    assert '' not in dawg
+
+
+def test_repr():
+    assert cows.Dawg().__repr__() == 'cows.Dawg()'
@@ -1,3 +1,8 @@
+import io
+import random
+import sys
+import threading
+
 import pytest
 
 import cows
@@ -51,3 +56,261 @@ def test_update(keys, expected):
 def test_repr():
     rdict = cows.Dict()
     assert rdict.__repr__() == 'cows.Dict()'
+
+
+def test_concurrent():
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    keys = ['A*C', 'AB*', 'ABC', 'GGG', 'G*G']
+    rdict = cows.Dict(updater=incr, concurrent=True)
+
+    def worker():
+        for _ in range(200):
+            for key in keys:
+                rdict[key] = 1
+                list(rdict[key])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(rdict.keys()) == ['A*C', 'GGG']
+    assert sum(rdict.values()) == 4 * 200 * len(keys)
+
+
+def test_limit():
+    rdict = cows.Dict(initialize=[('ATCG', 1), ('GCTA', 2), ('TT*A', 3)])
+
+    assert sorted(rdict.matches('****')) == [1, 2, 3]
+    assert len(list(rdict.matches('****', limit=2))) == 2
+    assert rdict.first('T*GA') == 3
+    assert rdict.first('GGGG') is None
+    assert rdict.first('GGGG', default=0) == 0
+    assert rdict.get_first_match('GCT*') == ('GCTA', 2)
+
+
+@pytest.mark.parametrize('selector', [
+    cows.most_specific,
+    lambda matches: cows.most_specific(list(matches)),
+])
+def test_most_specific(selector):
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    rdict = cows.Dict(selector=selector, updater=incr)
+    rdict.trie['A**T'] = 1
+    rdict.trie['ACGT'] = 1
+    rdict.trie['A*GT'] = 1
+
+    rdict['ACGT'] = 10
+    rdict['AGGT'] = 10
+    rdict['ATTT'] = 10
+
+    assert dict(rdict.items()) == {'ACGT': 11, 'A*GT': 11, 'A**T': 11}
+
+
+def test_from_file():
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    source = io.StringIO('ATCG\nGCTA\nAT*G\nGCTA\n')
+    rdict = cows.Dict.from_file(source, updater=incr)
+    assert dict(rdict.items()) == {'ATCG': 2, 'GCTA': 2}
+
+    rdict.update_from_stream(io.StringIO('ATCG\n'), value=len)
+    assert dict(rdict.items()) == {'ATCG': 6, 'GCTA': 2}
+
+
+@pytest.mark.parametrize(
+    'items',
+    [
+        (('ATCG', 1), ('GCTA', 2), ('ATCG', 3), ('AT', 4), ('GCTA', 5)),
+        (('ATCG', 1), ('GCTA', 2), ('AT*G', 3), ('*CTA', 4), ('TTTT', 5)),
+    ]
+)
+def test_bulk_load(items):
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    # Keys without wildcards are loaded before those with wildcards
+    expected = cows.Dict(updater=incr)
+    ordered = sorted(items, key=lambda item: ('*' in item[0], item[0]))
+    for key, value in ordered:
+        expected[key] = value
+
+    rdict = cows.Dict(updater=incr)
+    rdict.bulk_load(items, chunk_size=2)
+    assert dict(rdict.items()) == dict(expected.items())
+
+    # Loading into a non-empty dictionary
+    rdict.bulk_load(items)
+    for key, value in sorted(items, key=lambda item: item[0]):
+        expected[key] = value
+    assert dict(rdict.items()) == dict(expected.items())
+
+
+def test_bulk_load_unsorted():
+    rdict = cows.Dict(updater=lambda match, old, new: old + new)
+
+    with pytest.raises(ValueError):
+        rdict.bulk_load([('AB', 1), ('CD', 1), ('AB', 1)], presorted=True)
+
+
+def test_initialize_bulk():
+    rdict = cows.Dict(initialize=[('ATCG', 1), ('GCTA', 2), ('ATCG', 3)])
+    assert dict(rdict.items()) == {'ATCG': 3, 'GCTA': 2}
+
+
+@pytest.mark.parametrize('scan_ratio', [None, 0.0, 0.5, 2.0])
+def test_scan_ratio(scan_ratio):
+    keys = (('ATCG', 1), ('GCTA', 2), ('TT*A', 3), ('T*GA', 4), ('****', 5))
+    rdict = cows.Dict(initialize=keys, scan_ratio=scan_ratio,
+                      updater=lambda match, old, new: old + new)
+
+    assert dict(rdict.items()) == {'ATCG': 6, 'GCTA': 2, 'TT*A': 7}
+    assert sorted(rdict.matches('****')) == [2, 6, 7]
+    assert rdict.estimate_matches('****') == 3
+    assert rdict.estimate_matches('GGGG') == 0
+
+
+def test_scan_ratio_locked():
+    rdict = cows.Dict(initialize=[('ATCG', 1), ('GCTA', 2)],
+                      concurrent=True, scan_ratio=0.5)
+    estimate = rdict.trie.estimate_matches
+
+    def locked_estimate(key):
+        # Estimating walks the trie so must not race with writers
+        assert rdict.lock._readers == 1
+        return estimate(key)
+
+    rdict.trie.estimate_matches = locked_estimate
+    assert sorted(rdict.matches('****')) == [1, 2]
+
+
+def _random_dict(rand, size, alphabet):
+    return cows.Dict(
+        updater=lambda match, old, new: old + new,
+        initialize=[
+            (''.join(rand.choice(alphabet) for _ in range(rand.randint(1, 4))),
+             rand.randint(1, 10))
+            for _ in range(size)
+        ]
+    )
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_merge_exact(seed):
+    rand = random.Random(seed)
+    first = _random_dict(rand, 50, 'ACG')
+    second = _random_dict(rand, 50, 'ACG')
+
+    expected = _random_dict(random.Random(seed), 50, 'ACG')
+    for key, value in second.items():
+        expected[key] = value
+
+    first.merge(second)
+    assert dict(first.items()) == dict(expected.items())
+    assert len(first) == len(expected)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_merge_ambiguous(seed):
+    rand = random.Random(seed)
+    first = _random_dict(rand, 50, 'ACG*')
+    second = _random_dict(rand, 50, 'ACG*')
+    total = sum(first.values()) + sum(second.values())
+
+    first.merge(second)
+
+    # Every item is either combined with a match or added, and no two keys
+    # of the result match each other
+    assert sum(first.values()) == total
+    for key in first:
+        assert [m[0] for m in first.trie.get_matches(key)] == [key]
+
+
+def test_merge():
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    first = cows.Dict(updater=incr, initialize=[
+        ('ATCG', 1), ('GCTA', 2), ('G*TT', 3)
+    ])
+    second = cows.Dict(updater=incr, initialize=[
+        ('ATCG', 10), ('ATCC', 20), ('GATT', 30), ('TTTT', 40), ('*CTA', 50)
+    ])
+
+    first.merge(second)
+    assert dict(first.items()) == {
+        'ATCG': 11, 'ATCC': 20, 'GCTA': 52, 'G*TT': 33, 'TTTT': 40
+    }
+    assert len(second) == 5
+
+    with pytest.raises(ValueError):
+        first.merge(first)
+
+
+def test_merge_concurrent():
+    def incr(match, current_value, new_value):
+        return current_value + new_value
+
+    first = cows.Dict(updater=incr, concurrent=True,
+                      initialize=[('ATCG', 1), ('GC*A', 2)])
+    second = cows.Dict(updater=incr, concurrent=True, wildcard='N',
+                       initialize=[('ATCG', 1), ('TTNT', 2)])
+
+    def merge(into, other):
+        for _ in range(200):
+            into.merge(other)
+
+    def write():
+        for i in range(200):
+            second['CC{}'.format(i)] = 1
+
+    # Merges in both directions while writing must not deadlock.  Switching
+    # threads often makes the interleavings which would deadlock likely.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [
+            threading.Thread(target=merge, args=(first, second), daemon=True),
+            threading.Thread(target=merge, args=(second, first), daemon=True),
+            threading.Thread(target=write, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        sys.setswitchinterval(interval)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_update():
+    rdict = cows.Dict(updater=lambda match, old, new: old + new)
+    rdict.update(cows.Dict(initialize=[('ATCG', 1)]))
+    rdict.update({'ATCG': 2, 'GCTA': 3})
+    rdict.update([('AT*G', 4)])
+
+    assert dict(rdict.items()) == {'ATCG': 7, 'GCTA': 3}
+
+
+def test_merge_all():
+    rand = random.Random(0)
+    partials = [_random_dict(rand, 20, 'ACG') for _ in range(7)]
+    total = sum(sum(partial.values()) for partial in partials)
+
+    expected = cows.Dict(updater=lambda match, old, new: old + new)
+    for partial in partials:
+        for key, value in partial.items():
+            expected[key] = value
+
+    merged = cows.merge_all(partials)
+    assert dict(merged.items()) == dict(expected.items())
+    assert sum(merged.values()) == total
+
+    with pytest.raises(ValueError):
+        cows.merge_all([])
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+import cows
+from cows.index import CHUNK_BITS, PositionIndex
+
+
+@pytest.mark.parametrize(
+    'inputs,pattern,expected',
+    [
+        (('ATCG', 'A*TT', 'CTCG'), '*TCG', ('ATCG', 'CTCG')),
+        (('ATCG', 'A*TT', 'CTCG'), 'ATTT', ('A*TT',)),
+        (('ATCG', 'A*TT', 'CTCG'), 'ATC', ()),
+        (('ATCG', 'A*TT', 'CTCG'), '*****', ()),
+        (('ATCG', 'A*TT', 'CTCG'), '****', ('ATCG', 'A*TT', 'CTCG')),
+        (('ATCG', 'GCTA', 'TT*A'), 'T*GA', ('TT*A',)),
+        (('ATCG', 'GCTA', 'TT*A'), 'XXXX', ()),
+    ]
+)
+def test_get_matches(inputs, pattern, expected):
+    index = PositionIndex()
+    for key in inputs:
+        index.add(key, key)
+
+    assert len(index) == len(inputs)
+    assert sorted(m[0] for m in index.get_matches(pattern)) == sorted(
+        expected)
+
+
+def test_chunks():
+    rand = random.Random(0)
+    keys = [
+        ''.join(rand.choice('ACGT*') for _ in range(6))
+        for _ in range(CHUNK_BITS * 2 + 10)
+    ]
+    trie = cows.Trie(initialize=[(k, k) for k in keys])
+    indexed = cows.Trie(initialize=[(k, k) for k in keys], index_threshold=0)
+
+    for pattern in ('A*****', '**C**T', 'ACGTAC', '******'):
+        assert sorted(m[0] for m in indexed.get_matches(pattern)) == sorted(
+            m[0] for m in trie.get_matches(pattern))
+
+
+def test_set():
+    rset = cows.Set(['ABCD', '*EFG', 'T'], index_threshold=0.5)
+    rset.add('HEF*')
+    rset.add('X**Z')
+
+    assert sorted(rset) == ['*EFG', 'ABCD', 'T', 'X**Z']
+    assert rset.find('**FG') == '*EFG'
+    assert rset.dict.trie.index is not None
+    assert len(rset.dict.trie.index) == 4
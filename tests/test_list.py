@@ -104,3 +104,11 @@ def test_reverse(elements):
 def test_repr():
     rlist = cows.List(['A', 'B', 'C'])
     assert rlist.__repr__() == 'cows.List([\'A\', \'B\', \'C\'])'
+
+
+@pytest.mark.parametrize('elements', test_set)
+def test_from_file(tmp_path, elements):
+    path = tmp_path / 'reads.fasta'
+    path.write_text(''.join('>r\n{}\n'.format(e) for e in elements))
+
+    assert list(cows.List.from_file(str(path))) == elements
@@ -0,0 +1,64 @@
+import gzip
+import io
+
+import pytest
+
+from cows.readers import read_sequences
+
+
+SEQUENCES = ['ATCG', 'GGNNTA', 'CC']
+
+SOURCES = {
+    'plain': 'ATCG\nGGNNTA\n\nCC\n',
+    'fasta': '>r1\nATCG\n>r2 wrapped\nGGN\nNTA\n>r3\nCC\n',
+    'fastq': '@r1\nATCG\n+\nIIII\n@r2\nGGNNTA\n+\nIIIIII\n@r3\nCC\n+\nII\n',
+}
+
+
+@pytest.mark.parametrize('fmt', sorted(SOURCES))
+def test_formats(fmt):
+    content = SOURCES[fmt]
+    assert list(read_sequences(io.StringIO(content))) == SEQUENCES
+    assert list(read_sequences(io.StringIO(content), fmt=fmt)) == SEQUENCES
+
+
+@pytest.mark.parametrize('fmt', sorted(SOURCES))
+def test_leading_blank_lines(fmt):
+    content = '\n  \n' + SOURCES[fmt]
+    assert list(read_sequences(io.StringIO(content))) == SEQUENCES
+
+
+def test_empty():
+    assert list(read_sequences(io.StringIO(''))) == []
+    assert list(read_sequences(io.StringIO('\n\n'))) == []
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_path(tmp_path, compress):
+    path = tmp_path / 'reads.fastq'
+    if compress:
+        with gzip.open(str(path), 'wt') as fh:
+            fh.write(SOURCES['fastq'])
+    else:
+        path.write_text(SOURCES['fastq'])
+
+    assert list(read_sequences(str(path), chunk_size=16)) == SEQUENCES
+
+
+def test_progress():
+    reports = []
+
+    def report(progress):
+        reports.append((progress.records, progress.bases, progress.done))
+
+    list(read_sequences(io.StringIO(SOURCES['plain']), progress=report,
+                        report_every=2))
+
+    assert reports == [(2, 10, False), (3, 12, True)]
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        list(read_sequences(io.StringIO(''), fmt='bam'))
+    with pytest.raises(ValueError):
+        list(read_sequences(io.StringIO('@r1\nA\n+\nI\nA\n'), fmt='fastq'))
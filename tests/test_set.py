@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 import cows
@@ -32,3 +34,79 @@ def test_add(keys, expected):
 def test_repr():
     rset = cows.Set(['A', 'B', 'C'])
     assert rset.__repr__() == 'cows.Set([\'A\', \'B\', \'C\'])'
+
+
+def test_concurrent():
+    rset = cows.Set(concurrent=True)
+
+    def worker(offset):
+        for i in range(100):
+            rset.add('{:03d}'.format((i + offset) % 100))
+
+    threads = [
+        threading.Thread(target=worker, args=(i * 25,)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(rset) == 100
+
+
+def test_cache():
+    rset = cows.Set(['ABCD', '*EFG'], cache_size=10)
+    for key in ('ABCD', 'HEFG', 'ABCD'):
+        rset.add(key)
+
+    assert sorted(rset) == ['*EFG', 'ABCD']
+    assert rset.cache_info().hits == 1
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_find(concurrent):
+    rset = cows.Set(['ABCD', '*EFG', 'T'], concurrent=concurrent)
+
+    assert rset.find('ABC*') == 'ABCD'
+    assert rset.find('HEFG') == '*EFG'
+    assert rset.find('XYZ') is None
+    assert 'HEF*' in rset
+    assert 'XYZ' not in rset
+
+
+def test_contains():
+    rset = cows.Set(['ABC', 'D*F'])
+
+    # Membership takes into account wildcards on both sides, not only exact
+    # matches
+    assert 'ABC' in rset
+    assert 'A*C' in rset
+    assert 'DEF' in rset
+    assert 'D*F' in rset
+    assert 'AB' not in rset
+    assert 'ABD' not in rset
+    assert '' not in rset
+    assert 1 not in rset
+    assert None not in rset
+
+
+def test_contains_cached():
+    rset = cows.Set(['ACGT', 'GG*C'], cache_size=10)
+
+    before = rset.cache_info()
+
+    # Membership checks stop at the first match but still fill the cache
+    for _ in range(10):
+        assert 'ACGT' in rset
+    assert rset.find('GGTC') == 'GG*C'
+    assert rset.find('GGTC') == 'GG*C'
+    assert rset.cache_info().hits - before.hits == 10
+    assert rset.cache_info().misses - before.misses == 2
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / 'reads.txt'
+    path.write_text('\n'.join(test_set[0][0]))
+
+    rset = cows.Set.from_file(str(path))
+    assert sorted(rset) == sorted(test_set[0][1])
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 import cows
@@ -91,3 +93,153 @@ def test_items(inputs):
 
     for k, v in trie.items(extract_values=True):
         assert inputs[k] == v
+
+
+def test_cache():
+    trie = cows.Trie(initialize=[('ATCG', 1), ('GCTA', 2)], cache_size=10)
+
+    assert [m[0] for m in trie.get_matches('AT*G')] == ['ATCG']
+    assert [m[0] for m in trie.get_matches('AT*G')] == ['ATCG']
+    assert list(trie.get_matches('GGGG')) == []
+    assert trie.cache_info().hits == 1
+    assert trie.cache_info().misses == 2
+
+    # Updating an existing key does not invalidate and is visible via the
+    # cached node
+    trie['ATCG'] = 5
+    assert [m[1].value for m in trie.get_matches('AT*G')] == [5]
+    assert trie.cache_info().currsize == 2
+
+    # A new key only evicts the queries it matches
+    trie['ATTG'] = 3
+    assert trie.cache_info().currsize == 1
+    assert sorted(m[0] for m in trie.get_matches('AT*G')) == ['ATCG', 'ATTG']
+
+    assert cows.Trie().cache_info() is None
+
+
+def test_child_state():
+    trie = cows.Trie(initialize=[('ATCG', 1)], cache_size=10,
+                     index_threshold=0.5)
+
+    # Only the root stores the cache and index
+    for attr in ('cache', 'index', 'index_threshold'):
+        assert attr in vars(trie)
+        assert attr not in vars(trie['AT'])
+    assert trie['AT'].cache is None
+    assert trie['AT'].index is None
+
+
+@pytest.mark.parametrize('cache_size', [None, 10])
+def test_limit(cache_size):
+    trie = cows.Trie(initialize=[(k, k) for k in ('ATCG', 'A*TT', 'CTCG')],
+                     cache_size=cache_size)
+
+    for limit in (0, 1, 2, 3, 4):
+        matches = list(trie.get_matches('****', limit=limit))
+        assert len(matches) == min(limit, 3)
+        list(trie.get_matches('****'))
+
+    assert trie.get_first_match('*TCG')[0] in ('ATCG', 'CTCG')
+    assert trie.get_first_match('GGGG') is None
+
+
+@pytest.mark.parametrize(
+    'inputs,pattern,expected',
+    [
+        (
+            ('A**T', 'ACGT', 'A*GT', 'CCGT'),
+            'ACGT',
+            ['ACGT', 'A*GT', 'A**T']
+        ),
+        (
+            ('****', 'AB*D', 'ABC*', 'ABCD', 'XBCD'),
+            'AB**',
+            ['ABCD', 'AB*D', 'ABC*', '****']
+        ),
+        (
+            ('ATCG', 'A*TT'),
+            'GGGG',
+            []
+        ),
+    ]
+)
+def test_best_matches(inputs, pattern, expected):
+    trie = cows.Trie(initialize=[(k, k) for k in inputs])
+
+    assert [m[0] for m in trie.get_best_matches(pattern)] == expected
+    assert [m[0] for m in trie.get_best_matches(pattern, limit=1)] == (
+        expected[:1])
+
+
+@pytest.mark.parametrize('presorted', [False, True])
+def test_bulk_load(presorted):
+    inputs = [('ABCD', 1), ('AB', 2), ('ABCE', 3), ('B*', 4), ('ABCD', 5)]
+    if presorted:
+        inputs = sorted(inputs, key=lambda item: item[0])
+
+    trie = cows.Trie(cache_size=10)
+    list(trie.get_matches('AB'))
+    trie.bulk_load(inputs, presorted=presorted, chunk_size=2)
+
+    assert dict(trie.items(extract_values=True)) == {
+        'ABCD': 5, 'AB': 2, 'ABCE': 3, 'B*': 4
+    }
+    assert trie.cache_info().currsize == 0
+    assert [m[0] for m in trie.get_matches('AB')] == ['AB']
+
+
+def test_empty_key():
+    trie = cows.Trie()
+    with pytest.raises(IndexError):
+        trie[''] = 1
+    with pytest.raises(IndexError):
+        trie.bulk_load([('', 1), ('AB', 2)])
+    assert len(trie) == 0
+
+    # Every constructor path rejects empty keys alike
+    for iterable in (['', 'AB'], ['', 'A*']):
+        with pytest.raises(IndexError):
+            cows.Set(iterable)
+    with pytest.raises(IndexError):
+        cows.List([''])
+
+
+def test_size():
+    trie = cows.Trie(initialize=[('ABC', 1), ('AB', 2)])
+    trie['ABD'] = 3
+    trie['ABC'] = 4
+    trie.bulk_load([('AB', 5), ('XY', 6)])
+
+    assert len(trie) == 4
+    assert trie.size == len(list(trie.items()))
+    assert trie['A'].size == 3
+    assert trie['AB'].size == 3
+    assert trie['ABC'].size == 1
+
+
+@pytest.mark.parametrize(
+    'pattern',
+    ['****', 'A***', '**GT', 'ACGT', 'TTTT', '*', '******']
+)
+def test_estimate_matches(pattern):
+    rand = random.Random(0)
+    keys = [
+        ''.join(rand.choice('ACGT*') for _ in range(4)) for _ in range(200)
+    ]
+    trie = cows.Trie(initialize=[(k, k) for k in keys])
+    actual = len(list(trie.get_matches(pattern)))
+
+    # Exact when sampling is not needed
+    assert trie.estimate_matches(pattern, samples=1000) == actual
+
+    estimate = trie.estimate_matches(pattern, samples=8)
+    assert estimate == trie.estimate_matches(pattern, samples=8)
+    assert actual / 3 <= estimate <= actual * 3 or actual == estimate == 0
+
+
+@pytest.mark.parametrize('pattern', ['****', 'A***', 'ACGT', 'A*'])
+def test_scan_matches(pattern):
+    trie = cows.Trie(initialize=[(k, k) for k in ('ACGT', 'A**T', 'CCGT')])
+    assert sorted(m[0] for m in trie.scan_matches(pattern)) == sorted(
+        m[0] for m in trie.get_matches(pattern))
@@ -0,0 +1,119 @@
+import pytest
+
+import cows
+
+
+INPUTS = (('ABC', 1), ('ABD', 2), ('AB', 3), ('B*', 4), ('BCD', 5))
+
+
+@pytest.mark.parametrize(
+    'prefix,expected',
+    [
+        ('', ['AB', 'ABC', 'ABD', 'B*', 'BCD']),
+        ('A', ['AB', 'ABC', 'ABD']),
+        ('AB', ['AB', 'ABC', 'ABD']),
+        ('ABC', ['ABC']),
+        ('B', ['B*', 'BCD']),
+        ('X', []),
+        ('ABCD', []),
+    ]
+)
+def test_trie_views(prefix, expected):
+    trie = cows.Trie(initialize=INPUTS)
+    values = dict(INPUTS)
+
+    keys = trie.keys(prefix=prefix, sort=True)
+    assert list(keys) == expected
+    assert len(keys) == len(expected)
+    assert sorted(trie.keys(prefix=prefix)) == expected
+    for key in values:
+        assert (key in keys) == (key in expected)
+
+    items = trie.items(extract_values=True, prefix=prefix, sort=True)
+    assert list(items) == [(k, values[k]) for k in expected]
+    assert len(items) == len(expected)
+    for key in expected:
+        assert (key, values[key]) in items
+        assert (key, -1) not in items
+
+    assert list(trie.values(extract_values=True, prefix=prefix,
+                            sort=True)) == [values[k] for k in expected]
+    assert [n.value for n in trie.values(prefix=prefix, sort=True)] == [
+        values[k] for k in expected
+    ]
+
+
+def test_live():
+    trie = cows.Trie(initialize=INPUTS)
+    keys = trie.keys(prefix='A')
+    trie['AXY'] = 6
+
+    assert len(keys) == 4
+    assert 'AXY' in keys
+    assert 'A' not in keys
+    assert 5 not in keys
+
+
+def test_subtree():
+    trie = cows.Trie(initialize=INPUTS)
+    node = trie['A']
+
+    assert sorted(node.keys()) == ['AB', 'ABC', 'ABD']
+    assert 'ABC' in node.keys()
+    assert 'BC' not in node.keys()
+
+
+def test_dict_subview():
+    rdict = cows.Dict(initialize=INPUTS)
+
+    view = rdict.subview('AB', sort=True)
+    assert len(view) == 3
+    assert list(view) == ['AB', 'ABC', 'ABD']
+    assert list(view.values()) == [3, 1, 2]
+    assert list(view.items()) == [('AB', 3), ('ABC', 1), ('ABD', 2)]
+    assert 'ABC' in view
+    assert 'B*' not in view
+
+    assert list(rdict.keys(prefix='B', sort=True)) == ['B*', 'BCD']
+    assert len(rdict.items()) == len(rdict) == 5
+
+
+def test_set_operations():
+    trie = cows.Trie(initialize=INPUTS)
+    keys = trie.keys(prefix='AB')
+    items = trie.items(extract_values=True, prefix='AB')
+
+    assert keys == {'AB', 'ABC', 'ABD'}
+    assert keys & {'ABC', 'XYZ'} == {'ABC'}
+    assert keys - {'AB'} == {'ABC', 'ABD'}
+    assert keys.isdisjoint({'BCD'})
+    assert items == {('AB', 3), ('ABC', 1), ('ABD', 2)}
+    assert items & {('ABC', 1), ('ABD', -1)} == {('ABC', 1)}
+
+    assert 'ABC' not in items
+    assert 5 not in items
+    assert ('ABC', 1, 2) not in items
+
+    values = trie.values(extract_values=True, prefix='AB')
+    assert 3 in values
+    assert 5 not in values
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_dict_views(concurrent):
+    rdict = cows.Dict(initialize=INPUTS, concurrent=concurrent)
+    keys = rdict.keys(prefix='AB')
+    items = rdict.items(prefix='AB')
+    view = rdict.subview('AB', sort=True)
+
+    assert keys == {'AB', 'ABC', 'ABD'}
+    assert keys & {'ABC'} == {'ABC'}
+    assert ('ABC', 1) in items
+    assert 'ABC' not in items
+    assert sorted(rdict.values(prefix='AB')) == [1, 2, 3]
+
+    # Concurrent dictionaries return snapshots which do not see later writes
+    rdict['ABX'] = 6
+    assert ('ABX' in keys) == (not concurrent)
+    assert ('ABX' in view) == (not concurrent)
+    assert len(view) == (3 if concurrent else 4)
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+import cows
+from cows.wal import WriteAheadLog
+
+
+def incr(match, current_value, new_value):
+    return current_value + new_value
+
+
+def test_recover(tmp_path):
+    wal = WriteAheadLog(str(tmp_path), sync_every=2)
+    for key, value in (('ABC', 1), ('DEF', 2), ('ABC', 3)):
+        wal.append(key, value)
+    wal.close()
+
+    assert list(WriteAheadLog(str(tmp_path)).recover()) == [
+        ('ABC', 1), ('DEF', 2), ('ABC', 3)
+    ]
+
+
+def test_torn_write(tmp_path):
+    wal = WriteAheadLog(str(tmp_path))
+    wal.append('ABC', 1)
+    wal.append('DEF', 2)
+    wal.close()
+
+    path = os.path.join(str(tmp_path), 'log-0.bin')
+    with open(path, 'r+b') as handle:
+        handle.truncate(os.path.getsize(path) - 1)
+
+    wal = WriteAheadLog(str(tmp_path))
+    assert list(wal.recover()) == [('ABC', 1)]
+    wal.append('GHI', 3)
+    wal.close()
+
+    assert list(WriteAheadLog(str(tmp_path)).recover()) == [
+        ('ABC', 1), ('GHI', 3)
+    ]
+
+
+def test_checkpoint(tmp_path):
+    wal = WriteAheadLog(str(tmp_path), checkpoint_every=2)
+    wal.append('ABC', 1)
+    assert not wal.checkpoint_due()
+    wal.append('DEF', 2)
+    assert wal.checkpoint_due()
+
+    wal.checkpoint([('ABC', 1), ('DEF', 2)])
+    assert not wal.checkpoint_due()
+    wal.append('ABC', 5)
+    wal.close()
+
+    assert sorted(os.listdir(str(tmp_path))) == [
+        'checkpoint-1.bin', 'log-1.bin'
+    ]
+    assert list(WriteAheadLog(str(tmp_path)).recover()) == [
+        ('ABC', 1), ('DEF', 2), ('ABC', 5)
+    ]
+
+
+@pytest.mark.parametrize('checkpoint_every', [None, 1, 3])
+def test_dict(tmp_path, checkpoint_every):
+    keys = [('ATCG', 1), ('GCTA', 2), ('AT*G', 3), ('*CTA', 4), ('TTTT', 5)]
+
+    wal = WriteAheadLog(str(tmp_path), checkpoint_every=checkpoint_every)
+    rdict = cows.Dict(updater=incr, wal=wal, initialize=keys[:2])
+    for key, value in keys[2:]:
+        rdict[key] = value
+    expected = dict(rdict.items())
+    wal.close()
+
+    wal = WriteAheadLog(str(tmp_path), checkpoint_every=checkpoint_every)
+    recovered = cows.Dict(updater=incr, wal=wal)
+    assert dict(recovered.items()) == expected
+
+    recovered['ATCG'] = 10
+    recovered.checkpoint()
+    wal.close()
+
+    recovered = cows.Dict(updater=incr, wal=WriteAheadLog(str(tmp_path)))
+    expected['ATCG'] += 10
+    assert dict(recovered.items()) == expected
+
+
+def test_set(tmp_path):
+    wal = WriteAheadLog(str(tmp_path))
+    rset = cows.Set(['ABCD', '*EFG'], wal=wal)
+    rset.add('HEF*')
+    rset.add('T')
+    wal.close()
+
+    assert sorted(cows.Set(wal=WriteAheadLog(str(tmp_path)))) == [
+        '*EFG', 'ABCD', 'T'
+    ]
+
+
+def test_no_wal():
+    with pytest.raises(ValueError):
+        cows.Dict().checkpoint()